@@ -1,17 +1,20 @@
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
 import networkx as nx
 import matplotlib.pyplot as plt
 import streamlit as st
+import sentiment_engine
+import topic_model
+import text_features
 
-def deep_sentiment_analysis(df, text_column='content'):
-    # Analisis sentimen lebih mendalam
-    df['sentiment_score'] = df[text_column].apply(
-        lambda x: TextBlob(x).sentiment.polarity
-    )
+def deep_sentiment_analysis(df, text_column='content', scorer='textblob', use_cache=True):
+    # Analisis sentimen lebih mendalam (batch paralel, lihat sentiment_engine)
+    # Skor disimpan di app_data.db dan hanya konten baru/berubah yang diberi skor ulang;
+    # use_cache=False (tes, benchmark) memberi skor ulang semua teks tanpa menyentuh database
+    score = sentiment_engine.score_cached if use_cache else sentiment_engine.score_documents
+    scores, report = score(df[text_column].tolist(), scorer)
+    df['sentiment_score'] = scores
+    df.attrs['sentiment_report'] = report
     
     # Kategorikan sentimen
     df['sentiment_category'] = pd.cut(
@@ -22,30 +25,39 @@ def deep_sentiment_analysis(df, text_column='content'):
     
     return df
 
-def topic_modeling(df, text_column='content', n_topics=5):
-    # Ekstrak topik dengan LDA
-    vectorizer = TfidfVectorizer(max_df=0.95, min_df=2, stop_words='english')
-    tfidf = vectorizer.fit_transform(df[text_column])
+def topic_modeling(df, text_column='content', n_topics=5, model_name=None, features=None):
+    # Ekstrak topik dengan LDA online (lihat topic_model)
+    # Dengan model_name, model tersimpan dipakai ulang dan hanya dokumen baru yang dipelajari
+    # features: fitur teks bersama (mis. view.features) agar teks tidak ditokenisasi ulang.
+    # df tidak diubah, jadi view.df yang dipakai bersama antar sesi aman dikirim ke sini
+    features = features if features is not None else text_features.build(df[text_column])
+    model = topic_model.TopicModel.load(model_name) if model_name else None
+    if model is None or model.n_topics != n_topics:
+        model = topic_model.TopicModel(n_topics).fit(features)
+    else:
+        model.update(features)
+    if model_name:
+        model.save(model_name)
     
-    lda = LatentDirichletAllocation(
-        n_components=n_topics,
-        max_iter=5,
-        learning_method='online',
-        learning_offset=50.,
-        random_state=0
-    )
-    lda.fit(tfidf)
+    # Topik dominan per dokumen (kolom topic dan topic_weight, index sama dengan df) untuk filter
+    # di dashboard, di topics.attrs['assignments']
+    assignments = model.assign(features).set_axis(df.index)
     
     # Tampilkan topik
-    feature_names = vectorizer.get_feature_names_out()
-    topics = {}
-    
-    for topic_idx, topic in enumerate(lda.components_):
-        topics[f"Topik {topic_idx+1}"] = [
-            feature_names[i] for i in topic.argsort()[:-10 - 1:-1]
-        ]
-    
-    return pd.DataFrame(topics)
+    topics = model.topics()
+    topics.attrs['assignments'] = assignments
+    return topics
+
+def extract_keywords(df, text_column='content', n_keywords=20, features=None):
+    # Kata kunci dengan skor TF-IDF total tertinggi
+    features = features if features is not None else text_features.build(df[text_column])
+    return features.keywords(n_keywords)
+
+def find_duplicates(df, text_column='content', features=None):
+    # Kelompok artikel dengan isi kata yang sama persis (urutan dan stop words diabaikan), -1 jika unik.
+    # Dikembalikan sebagai Series (index sama dengan df); df tidak diubah
+    features = features if features is not None else text_features.build(df[text_column])
+    return pd.Series(features.duplicate_groups(), index=df.index, name='duplicate_group')
 
 def source_network_analysis(df, source_column='source'):
     # Analisis jaringan sumber berita
@@ -60,7 +72,7 @@ def source_network_analysis(df, source_column='source'):
     df['date'] = pd.to_datetime(df['date'])
     df['date_str'] = df['date'].dt.date.astype(str)
     
-    source_date = df.groupby([source_column, 'date_str']).size().reset_index()
+    source_date = df.groupby([source_column, 'date_str'], observed=True).size().reset_index()
     source_pairs = source_date.groupby('date_str')[source_column].apply(list)
     
     for date, sources in source_pairs.items():
@@ -2,9 +2,12 @@ import streamlit as st
 from dotenv import load_dotenv
 from auth import login_user, register_user, init_db as init_auth_db
 from database import init_db as init_app_db
+import ingestion_jobs
+import dataset_view
 import logging
 import os
 import sys
+import time
 from contextlib import contextmanager
 
 # Impor fungsi show dari masing-masing tab
@@ -15,6 +18,30 @@ from components.tab_insights import show as show_insights
 from components.tab_forecasting import show as show_forecasting
 from components.tab_about import show as show_about
 
+# Halaman dashboard (label navigasi -> fungsi show)
+PAGES = {
+    "📊 Overview": show_overview,
+    "📤 Upload Data": show_upload,
+    "🧠 AI Lab": show_ai_lab,
+    "💡 Insights": show_insights,
+    "🔮 Forecasting": show_forecasting,
+    "ℹ️ About": show_about
+}
+
+# Widget halaman yang pilihannya dipertahankan saat pindah halaman. Streamlit menghapus
+# state widget yang tidak dirender, dan navigasi hanya merender halaman aktif.
+# File di uploader tidak bisa dipertahankan; dataset yang sudah dimuat tetap ada di session.
+PERSISTENT_WIDGETS = [
+    "overview_top_sources",
+    "upload_mode",
+    "forecast_date_column",
+    "forecast_metric_column",
+    "forecast_category_column",
+    "forecast_time_window",
+    "forecast_periods",
+    "forecast_method"
+]
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,6 +69,12 @@ init_app_db()
 DEFAULT_STATE = {
     'df': None,
     'data_profile': None,
+    'dataset_key': None,
+    'upload_file_id': None,
+    'uploader_key': 0,
+    'ingest_job': None,
+    'ingest_error': None,
+    'dataset_filters': None,
     'ai_history': [],
     'authenticated': False,
     'user': "",
@@ -108,10 +141,18 @@ else:
         st.info("Selamat datang di ProMedia Insight Hub!")
         st.caption(f"Role: {st.session_state.role}")
         
+        # Ambil hasil ingestion latar belakang yang sudah selesai
+        ingestion_jobs.collect()
+        if ingestion_jobs.active_job() is not None:
+            ingestion_jobs.progress_panel()
+        dataset_view.filter_panel()
+        
         if st.session_state.role == "admin":
             registration_ui()
         
         if st.button("Logout", use_container_width=True):
+            if ingestion_jobs.active_job() is not None:
+                ingestion_jobs.active_job().cancel()
             for key in list(st.session_state.keys()):
                 if key not in DEFAULT_STATE:
                     del st.session_state[key]
@@ -197,16 +238,22 @@ else:
     st.markdown('<h1 class="header-title">📊 ProMedia Insight Hub</h1>', unsafe_allow_html=True)
     st.caption("Dashboard Analisis Media Berbasis AI - Eksplorasi, Insight, dan Visualisasi Data Berita")
 
-    # Create main tabs
-    tabs = st.tabs([
-        "📊 Overview", "📤 Upload Data", "🧠 AI Lab", "💡 Insights",  "🔮 Forecasting", "ℹ️ About"
-    ])
+    # Tulis ulang nilai widget tiap rerun agar tidak dibersihkan saat halamannya tidak dirender
+    for key in PERSISTENT_WIDGETS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+    # Navigasi halaman: hanya halaman aktif yang dijalankan setiap rerun
+    page = st.radio(
+        "Halaman",
+        list(PAGES),
+        horizontal=True,
+        key="active_page",
+        label_visibility="collapsed"
+    )
     
-    # Display tab content with global error handling
+    # Display page content with global error handling
     with st_exception_handler():
-        show_overview(tabs[0])
-        show_upload(tabs[1])
-        show_ai_lab(tabs[2])
-        show_insights(tabs[3])
-        show_forecasting(tabs[4])
-        show_about(tabs[5])
+        start = time.perf_counter()
+        PAGES[page](st.container())
+        logger.info(f"Halaman {page} dirender dalam {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,67 @@
+"""
+Compare the unified ingestion engine against the pre-refactor upload path.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingestion --sizes 100000 1000000 5000000
+"""
+import argparse
+import time
+import tracemalloc
+import pandas as pd
+
+import ingestion
+from benchmarks.synthetic import make_csv_upload
+
+LEGACY_COLUMN_MAPPING = {
+    'tanggal': 'date',
+    'judul': 'title',
+    'sentimen': 'sentiment',
+    'sumber': 'source',
+    'isi': 'content',
+    'kategori': 'category'
+}
+
+def legacy_process_upload(uploaded_file):
+    """utils.process_upload as it was before the ingestion engine (minus st.warning)"""
+    df = pd.read_csv(uploaded_file)
+    df.columns = [col.strip().lower() for col in df.columns]
+    df.rename(columns=lambda x: LEGACY_COLUMN_MAPPING.get(x, x), inplace=True)
+    required_columns = ['date', 'title', 'sentiment', 'source', 'content']
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        return None, missing_columns
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    valid_sentiments = ['positif', 'negatif', 'netral']
+    invalid_sentiments = df[~df['sentiment'].str.lower().isin(valid_sentiments)]
+    return df, len(invalid_sentiments)
+
+def engine_process_upload(uploaded_file):
+    df, report = ingestion.ingest(uploaded_file)
+    return df, report['issues'].get('invalid_sentiment', {}).get('count', 0)
+
+def measure(func, uploaded_file):
+    """Run func once, returning (seconds, peak traced MB, result)"""
+    uploaded_file.seek(0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(uploaded_file)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'path':>8} {'seconds':>9} {'peak MB':>9} {'invalid':>8}")
+    for n_rows in args.sizes:
+        upload = make_csv_upload(n_rows)
+        for label, func in [('legacy', legacy_process_upload), ('engine', engine_process_upload)]:
+            elapsed, peak, (df, invalid) = measure(func, upload)
+            print(f"{n_rows:>10} {label:>8} {elapsed:>9.2f} {peak:>9.1f} {invalid:>8}")
+            del df
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare sentiment scorers against TextBlob for speed and agreement.
+
+Run from the repository root:
+    python -m benchmarks.bench_sentiment --sizes 10000 100000
+
+Agreement is the share of documents that land in the same
+sentiment_category (the pd.cut thresholds of deep_sentiment_analysis)
+as with TextBlob.
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+import sentiment_engine
+from benchmarks.synthetic import make_news_frame
+
+BINS = [-1, -0.1, 0.1, 1]
+LABELS = ['negatif', 'netral', 'positif']
+
+def categories(scores):
+    return pd.cut(pd.Series(scores), bins=BINS, labels=LABELS)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--scorers', nargs='+', default=[name for name in sentiment_engine.SCORERS if name != 'textblob'])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'scorer':>10} {'seconds':>9} {'docs/sec':>11} {'speedup':>8} {'agree':>7} {'corr':>6}")
+    for n_rows in args.sizes:
+        texts = make_news_frame(n_rows)['content'].astype(str).tolist()
+        baseline, base_report = sentiment_engine.score_documents(texts, 'textblob')
+        base_categories = categories(baseline)
+        print(f"{n_rows:>9} {'textblob':>10} {base_report['seconds']:>9.2f} {base_report['docs_per_sec']:>11.0f}")
+        for name in args.scorers:
+            scores, report = sentiment_engine.score_documents(texts, name)
+            agree = (categories(scores) == base_categories).mean()
+            corr = np.corrcoef(scores, baseline)[0, 1] if scores.std() and baseline.std() else float('nan')
+            speedup = base_report['seconds'] / report['seconds']
+            print(f"{n_rows:>9} {name:>10} {report['seconds']:>9.2f} {report['docs_per_sec']:>11.0f} {speedup:>7.0f}x {agree:>7.1%} {corr:>6.2f}")
+
+if __name__ == '__main__':
+    main()
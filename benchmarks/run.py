@@ -0,0 +1,183 @@
+"""
+Benchmark the ingestion and dashboard hot paths on synthetic news data.
+
+Run from the repository root:
+    python -m benchmarks.run --sizes 10000 100000 1000000 5000000
+    python -m benchmarks.run --sizes 100000 --compare benchmarks/results/abc1234.json
+
+Results (best time, mean time and peak traced memory per case and size)
+are written to benchmarks/results/<label>.json, the label defaulting to
+the current git commit.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import utils
+import database
+import rollup
+import text_features
+from dataset_view import DatasetView
+from benchmarks.synthetic import make_news_frame, SyntheticUpload
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+# Analitik teks (TextBlob, LDA, networkx) terlalu lambat untuk jutaan baris
+TEXT_MAX_ROWS = 100_000
+
+def _analytics():
+    try:
+        import analytics
+    except ImportError as e:
+        return None, str(e)
+    return analytics, None
+
+def prepare(n_rows):
+    """Inputs shared by all cases for one dataset size"""
+    raw = make_news_frame(n_rows)
+    upload = SyntheticUpload(raw.to_csv(index=False).encode('utf-8'), f"synthetic_{n_rows}.csv")
+    clean = utils.validate_and_clean_data(raw.copy())
+    df, _ = utils.optimize_dtypes(clean.copy())
+    profile = utils.generate_data_profile(df)
+    cube = rollup.build(df, utils.metric_columns(df))
+    view = DatasetView(df, profile=profile, cube=cube)
+    view.index
+    return {'raw': raw, 'upload': upload, 'clean': clean, 'df': df, 'profile': profile, 'cube': cube, 'view': view}
+
+def _rewound(upload):
+    upload.seek(0)
+    return upload
+
+def overview_aggregations(profile):
+    """What the Overview derives from the profile on every render"""
+    day_counts = pd.Series(profile['day_counts'], dtype='int64')
+    day_counts.index = pd.to_datetime(day_counts.index)
+    top_sources = pd.Series(profile['source_counts'], dtype='int64').nlargest(10)
+    sentiment_counts = pd.Series(profile['sentiment_counts'], dtype='int64')
+    return day_counts.sort_index(), top_sources, sentiment_counts
+
+def filter_selection(view):
+    first = pd.Timestamp(view.profile['date_range']['min'])
+    sources = list(view.profile['sources'])[:2]
+    return view.index.select((first, first + pd.Timedelta(days=90)), source=sources, sentiment=['positif'])
+
+# (nama, fungsi(inputs), butuh analytics, maksimum baris)
+CASES = [
+    ('process_upload', lambda s: utils.process_upload(_rewound(s['upload'])), False, None),
+    ('validate_and_clean_data', lambda s: utils.validate_and_clean_data(s['raw'].copy()), False, None),
+    ('optimize_dtypes', lambda s: utils.optimize_dtypes(s['clean'].copy()), False, None),
+    ('generate_data_profile', lambda s: utils.generate_data_profile(s['df']), False, None),
+    ('rollup_build', lambda s: rollup.build(s['df'], utils.metric_columns(s['df'])), False, None),
+    ('overview_aggregations', lambda s: overview_aggregations(s['profile']), False, None),
+    ('filter_index_select', lambda s: filter_selection(s['view']), False, None),
+    ('plot_sentiment_timeseries', lambda s: utils.plot_sentiment_timeseries(s['cube']), False, None),
+    ('forecast_aggregation_cube', lambda s: rollup.aggregate(s['cube'], 'W', 'count', 'source'), False, None),
+    ('forecast_aggregation_rows', lambda s: s['view'].period_sum('W', 'date', 'count', 'source'), False, None),
+    ('deep_sentiment_analysis', lambda s, a: a.deep_sentiment_analysis(s['df'][['content']].astype(str), use_cache=False), True, TEXT_MAX_ROWS),
+    ('deep_sentiment_lexicon', lambda s, a: a.deep_sentiment_analysis(s['df'][['content']].astype(str), scorer='lexicon', use_cache=False), True, None),
+    # Setelah run pertama semua skor diambil dari cache
+    ('deep_sentiment_cached', lambda s, a: a.deep_sentiment_analysis(s['df'][['content']].astype(str)), True, None),
+    ('text_features_build', lambda s: text_features.build(s['df']['content']), False, None),
+    ('topic_modeling', lambda s, a: a.topic_modeling(s['df'][['content']].astype(str)), True, TEXT_MAX_ROWS),
+    ('source_network_analysis', lambda s, a: a.source_network_analysis(s['df'][['source', 'date']].copy()), True, TEXT_MAX_ROWS),
+]
+
+def measure(func, repeat):
+    """Best and mean wall time over repeat runs, then one traced run for peak memory (MB)"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), sum(times) / len(times), peak / 1e6
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['case'], r['rows']): r for r in json.load(f)['results'] if 'best_s' in r}
+    print(f"\nDibanding {baseline_path}:")
+    for r in results:
+        before = baseline.get((r['case'], r['rows']))
+        if before and 'best_s' in r:
+            print(f"{r['case']:>28} {r['rows']:>9} waktu x{r['best_s'] / before['best_s']:.2f} memori x{r['peak_mb'] / max(before['peak_mb'], 1e-9):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--cases', nargs='+', help="Only run these cases")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--label', default=None, help="Result file name (default: git commit)")
+    parser.add_argument('--compare', help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    # Cache sentimen benchmark tidak boleh mengisi app_data.db
+    database.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="bench_"), "app_data.db")
+    analytics, analytics_error = _analytics()
+    results = []
+    print(f"{'case':>28} {'rows':>9} {'best s':>9} {'mean s':>9} {'peak MB':>9}")
+    for n_rows in args.sizes:
+        inputs = prepare(n_rows)
+        for name, func, needs_analytics, max_rows in CASES:
+            if args.cases and name not in args.cases:
+                continue
+            entry = {'case': name, 'rows': n_rows}
+            if needs_analytics and analytics is None:
+                entry['skipped'] = f"analytics tidak bisa diimpor: {analytics_error}"
+            elif max_rows and n_rows > max_rows:
+                entry['skipped'] = f"melebihi {max_rows} baris"
+            else:
+                call = (lambda f=func: f(inputs, analytics)) if needs_analytics else (lambda f=func: f(inputs))
+                best, mean, peak = measure(call, args.repeat)
+                entry.update({'best_s': best, 'mean_s': mean, 'peak_mb': peak})
+            results.append(entry)
+            if 'skipped' in entry:
+                print(f"{name:>28} {n_rows:>9} dilewati ({entry['skipped']})")
+            else:
+                print(f"{name:>28} {n_rows:>9} {entry['best_s']:>9.3f} {entry['mean_s']:>9.3f} {entry['peak_mb']:>9.1f}")
+        del inputs
+        gc.collect()
+
+    commit = _git_commit()
+    label = args.label or commit or datetime.now().strftime('%Y%m%d-%H%M%S')
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(path, 'w') as f:
+        json.dump({
+            'meta': {
+                'commit': commit,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'repeat': args.repeat
+            },
+            'results': results
+        }, f, indent=2)
+    print(f"\nHasil disimpan ke {path}")
+    if args.compare:
+        _compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
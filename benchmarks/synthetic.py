@@ -0,0 +1,47 @@
+import io
+import numpy as np
+import pandas as pd
+
+SOURCES = ['detik.com', 'kompas.com', 'cnnindonesia.com', 'bisnis.com', 'tempo.co',
+           'tribunnews.com', 'liputan6.com', 'antaranews.com', 'okezone.com', 'republika.co.id']
+CATEGORIES = ['Teknologi', 'Lingkungan', 'Ekonomi', 'Politik', 'Kesehatan', 'Umum']
+SENTIMENTS = ['positif', 'negatif', 'netral']
+WORDS = ['pemerintah', 'ekonomi', 'digital', 'banjir', 'inflasi', 'startup', 'kebijakan',
+         'pajak', 'kesehatan', 'pendidikan', 'harga', 'naik', 'turun', 'program', 'nasional',
+         'warga', 'jakarta', 'bank', 'indonesia', 'investasi', 'bagus', 'buruk', 'krisis']
+
+def make_news_frame(n_rows, seed=0, n_days=365, invalid_ratio=0.01):
+    """Synthetic news frame shaped like data/sample_news.csv"""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    days = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, n_days, n_rows), unit='D')
+    # object, bukan <U7: nilai yang lebih panjang dari label valid tidak boleh terpotong
+    sentiment = rng.choice([s.capitalize() for s in SENTIMENTS] + SENTIMENTS, n_rows).astype(object)
+    # Sebagian kecil sentimen sengaja dibuat tidak valid
+    sentiment[rng.random(n_rows) < invalid_ratio] = 'campuran'
+    title_words = words[rng.integers(0, len(words), (n_rows, 4))]
+    content_words = words[rng.integers(0, len(words), (n_rows, 12))]
+    return pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'),
+        'title': [' '.join(row) for row in title_words],
+        'content': [' '.join(row) for row in content_words],
+        'category': rng.choice(CATEGORIES, n_rows),
+        'sentiment': sentiment,
+        'sentiment_score': rng.uniform(-1, 1, n_rows).round(2),
+        'count': rng.integers(1, 20, n_rows),
+        'source': rng.choice(SOURCES, n_rows)
+    })
+
+class SyntheticUpload(io.BytesIO):
+    """In-memory stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.file_id = name
+
+def make_csv_upload(n_rows, seed=0):
+    """Synthetic news CSV wrapped as an upload"""
+    data = make_news_frame(n_rows, seed).to_csv(index=False).encode('utf-8')
+    return SyntheticUpload(data, f"synthetic_{n_rows}.csv")
@@ -0,0 +1,118 @@
+import os
+import time
+import logging
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Jumlah titik maksimum per seri yang dikirim ke browser
+MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "1500"))
+# Jumlah seri maksimum per grafik; sisanya digabung ke kategori "Lainnya"
+MAX_SERIES = int(os.getenv("CHART_MAX_SERIES", "10"))
+OTHER_LABEL = "Lainnya"
+# Di atas jumlah titik ini grafik memakai trace WebGL (scattergl)
+WEBGL_THRESHOLD = 5000
+# Jumlah grafik yang disimpan per fungsi pembangun grafik (st.cache_data)
+FIGURE_CACHE_ENTRIES = int(os.getenv("FIGURE_CACHE_ENTRIES", "32"))
+# Metode downsampling: "lttb" menjaga bentuk kurva, "minmax" menjaga puncak dan lembah
+REDUCE_METHOD = os.getenv("CHART_REDUCE_METHOD", "lttb")
+
+def _as_float(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').view('int64').astype(float)
+    return values.to_numpy(dtype=float)
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of the threshold points that best keep the shape"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    # Titik pertama dan terakhir selalu dipakai, sisanya dibagi ke threshold-2 bucket
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.argmax(area))
+        selected[i + 1] = anchor
+    return selected
+
+def minmax(y, threshold):
+    """Indices of the minimum and maximum of each bucket (threshold // 2 buckets)"""
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    y = _as_float(y)
+    picked = []
+    for bucket in np.array_split(np.arange(n), threshold // 2):
+        values = y[bucket]
+        picked += [bucket[np.argmin(values)], bucket[np.argmax(values)]]
+    return np.unique(picked)
+
+def reduce_points(df, x, y, group=None, max_points=MAX_POINTS):
+    """Downsample every series of df (one per `group` value) to at most max_points"""
+    def reduce_one(series):
+        series = series.sort_values(x)
+        if REDUCE_METHOD == "minmax":
+            positions = minmax(series[y], max_points)
+        else:
+            positions = lttb(series[x], series[y], max_points)
+        return series.iloc[positions]
+
+    if group is None:
+        return reduce_one(df)
+    if df.groupby(group, observed=True).size().max() <= max_points:
+        return df
+    return pd.concat([reduce_one(series) for _, series in df.groupby(group, observed=True)], ignore_index=True)
+
+def cap_series(df, x, y, group, max_series=MAX_SERIES):
+    """Keep the max_series largest groups (by total y) and sum the rest into "Lainnya" """
+    totals = df.groupby(group, observed=True)[y].sum()
+    if len(totals) <= max_series:
+        return df
+    keep = totals.nlargest(max_series).index
+    labels = df[group].astype(object).where(df[group].isin(keep), OTHER_LABEL)
+    return df.groupby([df[x], labels.rename(group)], observed=True)[y].sum().reset_index()
+
+def line(df, x, y, color=None, **kwargs):
+    """
+    px.line with the data reduced for the browser.
+
+    Caps the number of series, downsamples each one and switches to
+    WebGL traces when many points remain.
+    """
+    if color:
+        df = cap_series(df, x, y, color)
+    df = reduce_points(df, x, y, color)
+    render_mode = 'webgl' if len(df) > WEBGL_THRESHOLD else 'svg'
+    return px.line(df, x=x, y=y, color=color, render_mode=render_mode, **kwargs)
+
+def _trace_points(trace):
+    # Trace pie tidak punya sumbu x, jumlah titiknya ada di values
+    for attr in ('x', 'values'):
+        values = getattr(trace, attr, None)
+        if values is not None:
+            return len(values)
+    return 0
+
+def plotly_chart(fig, name, **kwargs):
+    """st.plotly_chart that logs the points sent and the time spent serializing/rendering"""
+    points = sum(_trace_points(trace) for trace in fig.data)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Serialisasi tambahan hanya untuk mengukur ukuran payload saat debugging
+        logger.debug(f"Grafik '{name}': payload {len(fig.to_json()) / 1024:.0f} KB")
+    start = time.perf_counter()
+    st.plotly_chart(fig, **kwargs)
+    logger.info(f"Grafik '{name}': {points} titik, {(time.perf_counter() - start) * 1000:.0f} ms")
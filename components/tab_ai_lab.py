@@ -2,6 +2,8 @@ import streamlit as st
 from gemini_engine import gemini_engine
 from database import save_ai_history, get_ai_history, delete_ai_history
 import logging
+import ingestion_jobs
+from dataset_view import get_view
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ def show(tab):
             st.error("Google API Key tidak ditemukan di secrets. Pastikan Anda sudah menyetel GOOGLE_API_KEY di Streamlit secrets.")
             return
         
+        ingestion_jobs.loading_notice()
         # ==== Riwayat Percakapan AI ====
         st.subheader("Riwayat Percakapan")
         history = get_ai_history(limit=30)
@@ -70,11 +73,12 @@ def show(tab):
         question = st.text_area("Apa yang ingin Anda analisis dari data?", height=150)
         
         if st.button("Kirim ke AI", use_container_width=True) and question:
-            if 'df' not in st.session_state or st.session_state.df is None:
+            view = get_view()
+            if view is None:
                 st.warning("Silakan upload data terlebih dahulu di tab Upload Data")
             else:
                 with st.spinner("Menganalisis data..."):
                     history_context = [(h['prompt'], h['response']) for h in history]
-                    response = gemini_engine.ask(question, st.session_state.df, history_context)
+                    response = gemini_engine.ask(question, view.df, history_context)
                     save_ai_history(question, response)
                     st.rerun()
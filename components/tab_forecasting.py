@@ -1,13 +1,48 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 from sklearn.linear_model import LinearRegression
 from gemini_engine import gemini_engine
+from dataset_view import get_view
+import rollup
+import chart_reduce
+import utils
 import logging
+import ingestion_jobs
 
 logger = logging.getLogger(__name__)
 
+# Grafik di-cache per dataset (cache_key view) dan parameter; data lewat argumen _ tidak di-hash
+def _selectbox(label, options, key):
+    """Selectbox whose choice survives page switches (see PERSISTENT_WIDGETS in app.py)"""
+    # Pilihan tersimpan dari dataset lain bisa tidak ada lagi di opsi; Streamlit akan error
+    if key in st.session_state and st.session_state[key] not in options:
+        del st.session_state[key]
+    return st.selectbox(label, options, key=key)
+
+@st.cache_data(max_entries=chart_reduce.FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _history_figure(dataset_key, freq, date_column, metric_column, category_column, _df_agg):
+    """Historical trend per period; series capped ("Lainnya") and downsampled"""
+    return chart_reduce.line(
+        _df_agg,
+        'period',
+        metric_column,
+        color=category_column or None,
+        title=f'Tren {metric_column}'
+    )
+
+@st.cache_data(max_entries=chart_reduce.FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _forecast_figure(dataset_key, freq, date_column, metric_column, category_column, method, forecast_periods, _chart_df):
+    """Historical values followed by the projection"""
+    return chart_reduce.line(
+        _chart_df,
+        'periode',
+        'nilai',
+        color='tipe',
+        markers=True,
+        title=f"Forecasting {metric_column} ({method})"
+    )
+
 def show(tab):
     with tab:
         st.header("🔮 Forecasting & Strategi - Analisis Tren Berita")
@@ -20,73 +55,58 @@ def show(tab):
         """
         )
 
-        if 'df' not in st.session_state or st.session_state.df is None:
+        ingestion_jobs.loading_notice()
+        view = get_view()
+        if view is None:
             st.warning("📤 Silakan upload data terlebih dahulu di tab 'Upload Data'")
             return
 
-        df = st.session_state.df.copy()
+        # Read-only: agregasi langsung dari view tanpa menyalin dataset
+        df = view.df
 
         st.subheader("1. Pilih Data untuk Analisis")
         col1, col2 = st.columns(2)
 
         with col1:
-            date_cols = [col for col in df.columns if 'date' in col.lower()]
+            columns = [col for col in df.columns if col not in utils.INTERNAL_COLUMNS]
+            date_cols = [col for col in columns if 'date' in col.lower()]
             if not date_cols:
                 st.error("❌ Tidak ditemukan kolom tanggal di dataset")
                 return
-            date_column = st.selectbox("Kolom Tanggal", date_cols)
+            date_column = _selectbox("Kolom Tanggal", date_cols, "forecast_date_column")
 
-            numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+            numeric_cols = utils.metric_columns(df)
             if not numeric_cols:
                 st.error("❌ Tidak ditemukan kolom numerik di dataset")
                 return
-            metric_column = st.selectbox("Kolom Metrik", numeric_cols)
+            metric_column = _selectbox("Kolom Metrik", numeric_cols, "forecast_metric_column")
 
         with col2:
-            category_cols = [''] + [col for col in df.columns if col != date_column and col != metric_column]
-            category_column = st.selectbox("Kelompokkan Berdasarkan (opsional)", category_cols)
-            time_window = st.selectbox("Rentang Waktu", ["Harian", "Mingguan", "Bulanan"])
-            forecast_periods = st.slider("Jumlah Periode ke Depan", 1, 14, 7)
-            method = st.selectbox("Metode Forecasting", ["Moving Average", "Linear Regression"])
+            category_cols = [''] + [col for col in columns if col != date_column and col != metric_column]
+            category_column = _selectbox("Kelompokkan Berdasarkan (opsional)", category_cols, "forecast_category_column")
+            time_window = st.selectbox("Rentang Waktu", ["Harian", "Mingguan", "Bulanan"], key="forecast_time_window")
+            # Default lewat session_state: widget yang dipertahankan tidak boleh punya nilai default sendiri
+            st.session_state.setdefault("forecast_periods", 7)
+            forecast_periods = st.slider("Jumlah Periode ke Depan", 1, 14, key="forecast_periods")
+            method = st.selectbox("Metode Forecasting", ["Moving Average", "Linear Regression"], key="forecast_method")
 
         try:
-            df_clean = df.copy()
-            df_clean[date_column] = pd.to_datetime(df_clean[date_column], errors='coerce')
-            df_clean = df_clean.dropna(subset=[date_column])
-
             if time_window == "Harian":
-                df_clean['period'] = df_clean[date_column].dt.normalize()
                 freq = 'D'
             elif time_window == "Mingguan":
-                df_clean['period'] = df_clean[date_column].dt.to_period('W').dt.start_time
                 freq = 'W'
             else:
-                df_clean['period'] = df_clean[date_column].dt.to_period('M').dt.start_time
                 freq = 'M'
 
-            group_cols = ['period']
-            if category_column:
-                group_cols.append(category_column)
-            df_agg = df_clean.groupby(group_cols)[metric_column].sum().reset_index()
-            df_agg = df_agg.sort_values('period').reset_index(drop=True)
+            # Ganti rentang waktu/kelompok cukup membaca cube; baris mentah hanya untuk dimensi di luar cube
+            if date_column == 'date' and rollup.covers(view.cube, metric_column, category_column or None):
+                df_agg = rollup.aggregate(view.cube, freq, metric_column, category_column or None)
+            else:
+                df_agg = view.period_sum(freq, date_column, metric_column, category_column or None)
 
             st.subheader("📈 Data Historis")
-            if category_column:
-                fig_hist = px.line(
-                    df_agg,
-                    x='period',
-                    y=metric_column,
-                    color=category_column,
-                    title=f'Tren {metric_column}'
-                )
-            else:
-                fig_hist = px.line(
-                    df_agg,
-                    x='period',
-                    y=metric_column,
-                    title=f'Tren {metric_column}'
-                )
-            st.plotly_chart(fig_hist, use_container_width=True)
+            fig_hist = _history_figure(view.cache_key, freq, date_column, metric_column, category_column, df_agg)
+            chart_reduce.plotly_chart(fig_hist, "forecast_history", use_container_width=True)
 
             MIN_HISTORICAL_ROWS = 8
             if len(df_agg) < MIN_HISTORICAL_ROWS:
@@ -134,15 +154,10 @@ def show(tab):
                 pd.DataFrame({'periode': df_agg['period'], 'nilai': df_agg[metric_column], 'tipe': 'Historis'}),
                 pd.DataFrame({'periode': pred_df['periode_prediksi'], 'nilai': pred_df['nilai_prediksi'], 'tipe': 'Prediksi'})
             ])
-            fig_forecast = px.line(
-                chart_df,
-                x='periode',
-                y='nilai',
-                color='tipe',
-                markers=True,
-                title=f"Forecasting {metric_column} ({method})"
+            fig_forecast = _forecast_figure(
+                view.cache_key, freq, date_column, metric_column, category_column, method, forecast_periods, chart_df
             )
-            st.plotly_chart(fig_forecast, use_container_width=True)
+            chart_reduce.plotly_chart(fig_forecast, "forecast_projection", use_container_width=True)
 
             # AI hanya untuk strategi, bukan prediksi numerik
             st.subheader("💡 Rekomendasi Strategi oleh AI")
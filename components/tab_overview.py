@@ -1,7 +1,76 @@
+import html
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import utils
+from dataset_view import get_view
+import chart_reduce
+import ingestion_jobs
+
+# Jumlah sumber teratas pada kartu Top News Sources (bisa diubah pengguna sampai batas maksimum)
+TOP_SOURCES_DEFAULT = 10
+TOP_SOURCES_MAX = 50
+
+CHIP_STYLE = "background:#e8f1fb;padding:7px 15px;border-radius:20px;font-size:0.97rem;color:#1a3c6e;border:1px solid #b2c5df"
+
+def _source_chips(top_sources):
+    """All source chips as one HTML block (a single st.markdown element)"""
+    names = top_sources['source'].astype(str).map(html.escape)
+    chips = f"<span style='{CHIP_STYLE}'>" + names + " <b>" + top_sources['count'].astype(str) + "</b></span>"
+    return f"<div style='display:flex;flex-wrap:wrap;gap:8px;margin-bottom:10px;'>{''.join(chips)}</div>"
+
+# Pembangun grafik di-cache per dataset (cache_key view, sudah termasuk filter);
+# data diberikan lewat argumen berawalan _ sehingga tidak ikut di-hash
+@st.cache_data(max_entries=chart_reduce.FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _trend_figure(dataset_key, _daily_counts):
+    """Daily news count line chart (downsampled)"""
+    fig = chart_reduce.line(
+        _daily_counts,
+        'date_only',
+        'count',
+        title='',
+        labels={'date_only': 'Date', 'count': 'News Count'},
+        template='simple_white'
+    )
+    fig.update_traces(mode='lines+markers')
+    fig.update_layout(
+        plot_bgcolor='#f5f7fa',
+        paper_bgcolor='#f5f7fa',
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='#f0f0f0')
+    )
+    return fig
+
+@st.cache_data(max_entries=chart_reduce.FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _sentiment_figure(dataset_key, _sentiment_counts):
+    """Sentiment distribution pie chart"""
+    fig = px.pie(
+        _sentiment_counts,
+        names='sentiment',
+        values='count',
+        title='',
+        hole=0.35,
+        color_discrete_sequence=["#dae6f6", "#c9d8ee", "#b1cbe3"]
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_data(max_entries=chart_reduce.FIGURE_CACHE_ENTRIES, show_spinner=False)
+def _sources_figure(dataset_key, top_n, _top_sources):
+    """Top sources bar chart"""
+    fig = px.bar(
+        _top_sources,
+        x='source',
+        y='count',
+        title='',
+        labels={'source': 'Source', 'count': 'Count'},
+        color='count',
+        color_continuous_scale=["#34618c", "#a3c9e2"]
+    )
+    fig.update_layout(
+        plot_bgcolor='#f5f7fa',
+        paper_bgcolor='#f5f7fa'
+    )
+    return fig
 
 def show(tab):
     with tab:
@@ -12,7 +81,9 @@ def show(tab):
         </div>
         """, unsafe_allow_html=True)
         
-        if 'df' not in st.session_state or st.session_state.df is None:
+        ingestion_jobs.loading_notice()
+        view = get_view()
+        if view is None:
             st.markdown("""
             <div class="card">
                 <div class="card-title">🚩 Data Required</div>
@@ -21,8 +92,12 @@ def show(tab):
             """, unsafe_allow_html=True)
             return
             
-        df = st.session_state.df.copy()
-        profile = st.session_state.get('data_profile', utils.generate_data_profile(df))
+        # Semua statistik berasal dari profil dataset, tidak ada pemindaian ulang data
+        profile = view.profile
+        columns = view.columns
+        day_counts = pd.Series(profile['day_counts'], dtype='int64')
+        day_counts.index = pd.to_datetime(day_counts.index)
+        day_counts = day_counts.sort_index()
 
         # ==== KEY METRICS ====
         st.markdown("""
@@ -31,18 +106,21 @@ def show(tab):
         </div>
         """, unsafe_allow_html=True)
 
-        growth = (df.shape[0] - profile.get('n_news_prev', 0)) / (profile.get('n_news_prev', 1) or 1) * 100
-        total_source = df['source'].nunique() if 'source' in df.columns else "N/A"
-        if 'date' in df.columns:
-            min_date = df['date'].min().strftime('%d %b %Y')
-            max_date = df['date'].max().strftime('%d %b %Y')
+        growth = profile['growth']
+        if growth and growth['pct'] is not None:
+            growth_text = f"{'↑' if growth['pct'] >= 0 else '↓'} {abs(growth['pct']):.1f}% dibanding {growth['days']} hari sebelumnya"
+        else:
+            growth_text = "Belum ada periode pembanding"
+        total_source = profile['n_sources'] if 'source' in columns else "N/A"
+        if profile['date_range']:
+            min_date = pd.Timestamp(profile['date_range']['min']).strftime('%d %b %Y')
+            max_date = pd.Timestamp(profile['date_range']['max']).strftime('%d %b %Y')
             date_range = f"{min_date} - {max_date}"
         else:
             date_range = "N/A"
-        if 'sentiment' in df.columns:
-            sentiment_counts = df['sentiment'].value_counts()
-            dominant_sentiment = sentiment_counts.idxmax()
-            color = "#1a3c6e" if dominant_sentiment == "Positif" else "#e74c3c"
+        if profile['dominant_sentiment']:
+            dominant_sentiment = profile['dominant_sentiment']
+            color = "#1a3c6e" if str(dominant_sentiment).lower() == "positif" else "#e74c3c"
         else:
             dominant_sentiment = "N/A"
             color = "#e74c3c"
@@ -59,10 +137,10 @@ def show(tab):
                 width:100%;
                 padding: 1.3rem 1.1rem 1.1rem 1.2rem;
                 margin-bottom: 0.7rem;">
-                <div style="font-size:2.15rem;font-weight:700;">{len(df)}</div>
+                <div style="font-size:2.15rem;font-weight:700;">{profile['total_news']}</div>
                 <div style="font-size:1.02rem;">Total Berita</div>
                 <div style="color:#43aa8b; font-size:13px; margin-top:5px;">
-                    {'↑' if growth>=0 else '↓'} {abs(growth):.1f}% dibanding periode sebelumnya
+                    {growth_text}
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -118,9 +196,9 @@ def show(tab):
             <div class="card" style="background:#f3f7fa;border-left:5px solid #43aa8b;box-shadow:0 3px 14px 0 #d1dbec24;">
                 <b>🔥 Hari Teraktif:</b>
         """, unsafe_allow_html=True)
-        if 'date' in df.columns:
-            busiest_day = df['date'].dt.date.value_counts().idxmax()
-            count_busiest = df['date'].dt.date.value_counts().max()
+        if profile['busiest_day']:
+            busiest_day = profile['busiest_day']['date']
+            count_busiest = profile['busiest_day']['count']
             st.markdown(f"""<span style="font-size:1.13rem;">{busiest_day} — {count_busiest} berita</span>""", unsafe_allow_html=True)
         st.markdown("</div></div>", unsafe_allow_html=True)
 
@@ -131,26 +209,11 @@ def show(tab):
             <div class="card" style="background:#f5f7fa;box-shadow:0 3px 14px 0 #d1dbec24;">
                 <div class="card-title">Trend Analysis</div>
         """, unsafe_allow_html=True)
-        if 'date' in df.columns:
-            df['date_only'] = df['date'].dt.date
-            daily_counts = df.groupby('date_only').size().reset_index(name='count')
+        if 'date' in columns:
+            daily_counts = day_counts.rename_axis('date_only').reset_index(name='count')
             if not daily_counts.empty:
-                fig = px.line(
-                    daily_counts, 
-                    x='date_only', 
-                    y='count',
-                    title='',
-                    labels={'date_only': 'Date', 'count': 'News Count'},
-                    template='simple_white'
-                )
-                fig.update_traces(mode='lines+markers')
-                fig.update_layout(
-                    plot_bgcolor='#f5f7fa',
-                    paper_bgcolor='#f5f7fa',
-                    xaxis=dict(showgrid=False),
-                    yaxis=dict(showgrid=True, gridcolor='#f0f0f0')
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                fig = _trend_figure(view.cache_key, daily_counts)
+                chart_reduce.plotly_chart(fig, "overview_trend", use_container_width=True)
             else:
                 st.info("No data available for trend analysis")
         else:
@@ -164,20 +227,12 @@ def show(tab):
             <div class="card" style="background:#f5f7fa;box-shadow:0 3px 14px 0 #d1dbec24;">
                 <div class="card-title">Sentiment Distribution</div>
         """, unsafe_allow_html=True)
-        if 'sentiment' in df.columns:
-            sentiment_counts = df['sentiment'].value_counts().reset_index()
+        if 'sentiment' in columns:
+            sentiment_counts = pd.Series(profile['sentiment_counts'], dtype='int64').sort_values(ascending=False).reset_index()
             sentiment_counts.columns = ['sentiment', 'count']
             if not sentiment_counts.empty:
-                fig2 = px.pie(
-                    sentiment_counts, 
-                    names='sentiment', 
-                    values='count',
-                    title='',
-                    hole=0.35,
-                    color_discrete_sequence=["#dae6f6", "#c9d8ee", "#b1cbe3"]
-                )
-                fig2.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig2, use_container_width=True)
+                fig2 = _sentiment_figure(view.cache_key, sentiment_counts)
+                chart_reduce.plotly_chart(fig2, "overview_sentiment", use_container_width=True)
             else:
                 st.info("No sentiment data available")
         else:
@@ -191,31 +246,15 @@ def show(tab):
             <div class="card" style="background:#f5f7fa;box-shadow:0 3px 14px 0 #d1dbec24;">
                 <div class="card-title">Top News Sources</div>
         """, unsafe_allow_html=True)
-        if 'source' in df.columns:
-            top_sources = df['source'].value_counts().head(10).reset_index()
+        if 'source' in columns:
+            st.session_state.setdefault("overview_top_sources", TOP_SOURCES_DEFAULT)
+            top_n = st.slider("Jumlah sumber", 5, TOP_SOURCES_MAX, step=5, key="overview_top_sources")
+            top_sources = pd.Series(profile['source_counts'], dtype='int64').nlargest(top_n).reset_index()
             top_sources.columns = ['source', 'count']
             if not top_sources.empty:
-                st.markdown("<div style='display:flex;flex-wrap:wrap;gap:8px;margin-bottom:10px;'>", unsafe_allow_html=True)
-                for _, row in top_sources.iterrows():
-                    st.markdown(
-                        f"""<span style='background:#e8f1fb;padding:7px 15px;border-radius:20px;font-size:0.97rem;color:#1a3c6e;border:1px solid #b2c5df'>{row["source"]} <b>{row["count"]}</b></span>""",
-                        unsafe_allow_html=True
-                    )
-                st.markdown("</div>", unsafe_allow_html=True)
-                fig3 = px.bar(
-                    top_sources, 
-                    x='source', 
-                    y='count',
-                    title='',
-                    labels={'source': 'Source', 'count': 'Count'},
-                    color='count',
-                    color_continuous_scale=["#34618c", "#a3c9e2"]
-                )
-                fig3.update_layout(
-                    plot_bgcolor='#f5f7fa',
-                    paper_bgcolor='#f5f7fa'
-                )
-                st.plotly_chart(fig3, use_container_width=True)
+                st.markdown(_source_chips(top_sources), unsafe_allow_html=True)
+                fig3 = _sources_figure(view.cache_key, top_n, top_sources)
+                chart_reduce.plotly_chart(fig3, "overview_sources", use_container_width=True)
             else:
                 st.info("No source data available")
         else:
@@ -1,6 +1,125 @@
 import streamlit as st
 import pandas as pd
 import utils
+import dataset_cache
+import dataset_store
+import ingestion
+import ingestion_jobs
+
+def _select_sheet(uploaded_file):
+    """
+    Let the user pick a sheet when an .xlsx upload has more than one.
+
+    Returns (ready, sheet_name); ready is False while no sheet has been
+    chosen yet or when the workbook cannot be opened (the error is shown).
+    """
+    if not uploaded_file.name.endswith('.xlsx'):
+        return True, None
+    cached = st.session_state.get('excel_sheets')
+    if cached is None or cached[0] != uploaded_file.file_id:
+        try:
+            cached = (uploaded_file.file_id, utils.list_excel_sheets(uploaded_file), None)
+        except Exception as e:
+            cached = (uploaded_file.file_id, [], f"Error memproses file: {str(e)}")
+        st.session_state.excel_sheets = cached
+    _, sheets, error = cached
+    if error:
+        st.error(f"❌ Error: {error}")
+        return False, None
+    if len(sheets) <= 1:
+        return True, None
+    # Tanpa pilihan default: data bisa saja ada di sheet selain yang pertama
+    sheet_name = st.selectbox("Pilih sheet", sheets, index=None, placeholder="Pilih sheet berisi data")
+    if sheet_name is None:
+        st.info("📑 File ini memiliki beberapa sheet. Pilih sheet untuk mulai memuat data.")
+        return False, None
+    return True, sheet_name
+
+def _select_mode():
+    """
+    Replace the dataset, or append to it when one is already loaded.
+
+    Rendered above the uploader so the mode is fixed before a file starts
+    loading; changing it later does not reload a file already processed.
+    """
+    if st.session_state.df is None:
+        return 'replace'
+    choice = st.radio(
+        "Mode upload",
+        ["Ganti dataset", "Tambahkan ke dataset"],
+        horizontal=True,
+        key="upload_mode",
+        help="Mode tambah hanya menyimpan baris baru (kunci: judul + sumber + tanggal)"
+    )
+    return 'append' if choice == "Tambahkan ke dataset" else 'replace'
+
+def _load_upload(uploaded_file, sheet_name=None, mode='replace'):
+    """
+    Return (df, error) for an upload, reusing parsed results when possible.
+
+    Uncached uploads are handed to a background ingestion job; both values
+    are None while that job is running.
+    """
+    # Rerun dengan file yang sama: data sudah ada di session.
+    # Mode tidak termasuk kunci: mengganti mode setelah file dimuat tidak boleh memproses ulang file itu
+    upload_id = (uploaded_file.file_id, sheet_name)
+    if st.session_state.get('upload_file_id') == upload_id and st.session_state.df is not None:
+        return st.session_state.df, None
+    
+    job = ingestion_jobs.active_job()
+    if job is not None and job.upload_id == upload_id:
+        return None, None
+    failed = st.session_state.get('ingest_error')
+    if failed and failed[0] == upload_id:
+        return None, failed[1]
+    
+    # Hasil parsing Excel ikut di-cache sebagai Parquet, upload ulang tidak membuka openpyxl lagi.
+    # File yang sama dari sesi lain memakai salinan bersama di memori.
+    dataset_key = dataset_cache.content_hash(uploaded_file, uploaded_file.name, sheet_name)
+    cached = dataset_store.load(dataset_key)
+    if cached is not None:
+        dataset_store.register(dataset_key, uploaded_file.name, len(cached[0]), st.session_state.get('user'))
+        df, profile = cached
+        if mode == 'append':
+            ingestion_jobs.append_result(upload_id, dataset_key, df, profile)
+        else:
+            ingestion_jobs.apply_result(upload_id, dataset_key, df, profile)
+        return st.session_state.df, None
+    
+    # Proses di latar belakang, progres tampil di sidebar
+    ingestion_jobs.submit(uploaded_file, upload_id, dataset_key, sheet_name, mode)
+    st.rerun()
+
+def _select_stored():
+    """Pick a dataset another session already uploaded to the server"""
+    datasets = dataset_store.list_datasets()
+    if not datasets:
+        return
+    with st.expander("🗄️ Dataset tersimpan di server"):
+        labels = {
+            d['id']: f"{d['name']} — {d['rows']:,} baris ({d['created_by'] or '-'}, {d['created_at']})"
+            for d in datasets
+        }
+        dataset_id = st.selectbox(
+            "Pilih dataset",
+            list(labels),
+            format_func=labels.get,
+            index=list(labels).index(st.session_state.dataset_key) if st.session_state.dataset_key in labels else 0
+        )
+        col1, col2 = st.columns(2)
+        if col1.button("Gunakan dataset ini", use_container_width=True):
+            loaded = dataset_store.load(dataset_id)
+            if loaded is None:
+                st.error("❌ Dataset tidak ditemukan di server.")
+                return
+            df, profile = loaded
+            ingestion_jobs.apply_result(('stored', dataset_id), dataset_id, df, profile)
+            # Kosongkan uploader agar file lama tidak memuat ulang dataset sebelumnya
+            st.session_state.uploader_key += 1
+            st.rerun()
+        if st.session_state.role == "admin" and col2.button("Hapus dari registry", use_container_width=True):
+            dataset_store.remove(dataset_id)
+            st.rerun()
 
 def show(tab):
     with tab:
@@ -39,34 +158,54 @@ def show(tab):
         st.markdown("""
         <div class="card">
             <div class="card-title">📁 Upload Data</div>
-            <p>Upload file data berita (CSV atau Excel)</p>
+            <p>Upload file data berita (CSV, Excel, Parquet, Feather atau JSONL)</p>
         """, unsafe_allow_html=True)
         
+        _select_stored()
+        mode = _select_mode()
+        
         uploaded_file = st.file_uploader(
             "Pilih file",
-            type=["csv", "xlsx", "xls"],
+            key=f"uploader_{st.session_state.uploader_key}",
+            type=utils.SUPPORTED_EXTENSIONS,
             help="Maksimal ukuran file: 200MB",
             label_visibility="collapsed"
         )
         
-        if uploaded_file is not None:
-            # Process uploaded file
-            df, error = utils.process_upload(uploaded_file)
+        ready, sheet_name = _select_sheet(uploaded_file) if uploaded_file is not None else (False, None)
+        if ready:
+            df, error = _load_upload(uploaded_file, sheet_name, mode)
             
             if error:
                 st.error(f"❌ Error: {error}")
+                # Error disimpan per upload; tanpa tombol ini file yang sama harus diupload ulang
+                if st.button("🔄 Coba lagi", key="retry_ingest"):
+                    st.session_state.ingest_error = None
+                    st.rerun()
+            elif df is None:
+                st.info("⏳ File sedang diproses di latar belakang. Tab lain tetap bisa digunakan; progres tampil di sidebar.")
             else:
-                st.session_state.df = df
-                st.session_state.data_profile = utils.generate_data_profile(df)
                 st.success("✅ Data berhasil diupload!")
                 
+                appended = (st.session_state.data_profile or {}).get('appended')
+                if appended:
+                    st.info(f"➕ {appended['rows']} baris baru ditambahkan, {appended['duplicates']} duplikat dilewati")
+                
+                validation = (st.session_state.data_profile or {}).get('validation')
+                if validation:
+                    for message in ingestion.describe_issues(validation):
+                        st.warning(message)
+                    for col, detected in validation.get('date_formats', {}).items():
+                        if detected['format']:
+                            st.caption(f"📅 Format {col} terdeteksi: `{detected['format']}` ({detected['failed']} baris gagal dibaca)")
+                
                 # Show data preview
                 st.markdown("""
                 <div class="card">
                     <div class="card-title">👀 Data Preview</div>
                 """, unsafe_allow_html=True)
                 
-                st.dataframe(df.head(10), use_container_width=True)
+                st.dataframe(df.head(10).drop(columns=utils.INTERNAL_COLUMNS, errors='ignore'), use_container_width=True)
                 st.markdown("</div>", unsafe_allow_html=True)  # Close card
                 
                 # Show data summary
@@ -75,15 +214,26 @@ def show(tab):
                     <div class="card-title">📊 Data Summary</div>
                 """, unsafe_allow_html=True)
                 
+                profile = st.session_state.data_profile or {}
+                if not utils.profile_is_current(profile):
+                    profile = {**profile, **utils.generate_data_profile(df)}
+                    st.session_state.data_profile = profile
                 col1, col2, col3 = st.columns(3)
-                col1.metric("Total Berita", len(df))
-                col2.metric("Sumber Berita", df['source'].nunique())
+                col1.metric("Total Berita", profile['total_news'])
+                col2.metric("Sumber Berita", profile['n_sources'])
                 
-                if 'date' in df.columns:
-                    min_date = df['date'].min().strftime('%d %b %Y')
-                    max_date = df['date'].max().strftime('%d %b %Y')
+                if profile['date_range']:
+                    min_date = pd.Timestamp(profile['date_range']['min']).strftime('%d %b %Y')
+                    max_date = pd.Timestamp(profile['date_range']['max']).strftime('%d %b %Y')
                     col3.metric("Rentang Tanggal", f"{min_date} - {max_date}")
                 
+                memory = profile.get('memory')
+                if memory:
+                    st.caption(
+                        f"💾 Memori dataset: {memory['after'] / 1e6:.1f} MB "
+                        f"(hemat {memory['saved'] / 1e6:.1f} MB dari {memory['before'] / 1e6:.1f} MB)"
+                    )
+                
                 st.markdown("</div>", unsafe_allow_html=True)  # Close card
         
         st.markdown("</div>", unsafe_allow_html=True)  # Close card
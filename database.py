@@ -5,6 +5,9 @@ import logging
 DB_PATH = os.path.join(os.path.dirname(__file__), "app_data.db")
 logger = logging.getLogger(__name__)
 
+# Batas parameter per query SQLite (aman untuk versi SQLite lama)
+SQL_BATCH_SIZE = 900
+
 def init_db():
     """Initialize the database"""
     with sqlite3.connect(DB_PATH) as conn:
@@ -29,6 +32,8 @@ def init_db():
             )
         """)
         conn.commit()
+    init_dataset_registry()
+    init_sentiment_cache()
 
 def save_custom_insight(title, content, tags):
     """Save custom insight to database"""
@@ -107,3 +112,92 @@ def delete_ai_history(history_id=None, all_history=False):
         elif history_id is not None:
             c.execute("DELETE FROM ai_history WHERE id=?", (history_id,))
         conn.commit()
+
+def init_dataset_registry():
+    """Create the shared dataset registry table"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS datasets (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                created_by TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.commit()
+
+def save_dataset(dataset_id, name, rows, created_by=None):
+    """Register a dataset (no-op if the id is already registered)"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute(
+            "INSERT OR IGNORE INTO datasets (id, name, rows, created_by) VALUES (?, ?, ?, ?)",
+            (dataset_id, name, rows, created_by)
+        )
+        conn.commit()
+
+def get_datasets():
+    """Get all registered datasets, newest first"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("SELECT id, name, rows, created_by, created_at FROM datasets ORDER BY created_at DESC")
+        rows = c.fetchall()
+        datasets = []
+        for row in rows:
+            datasets.append({
+                'id': row[0],
+                'name': row[1],
+                'rows': row[2],
+                'created_by': row[3],
+                'created_at': row[4]
+            })
+        return datasets
+
+def delete_dataset(dataset_id):
+    """Remove a dataset from the registry"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM datasets WHERE id=?", (dataset_id,))
+        conn.commit()
+
+def init_sentiment_cache():
+    """Create the sentiment score cache table"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment_cache (
+                content_hash TEXT NOT NULL,
+                scorer TEXT NOT NULL,
+                polarity REAL NOT NULL,
+                PRIMARY KEY (content_hash, scorer)
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+
+def get_sentiment_scores(content_hashes, scorer):
+    """Cached polarity per content hash for one scorer version (missing hashes are left out)"""
+    content_hashes = list(content_hashes)
+    scores = {}
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        for i in range(0, len(content_hashes), SQL_BATCH_SIZE):
+            batch = content_hashes[i:i + SQL_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            c.execute(
+                f"SELECT content_hash, polarity FROM sentiment_cache WHERE scorer=? AND content_hash IN ({placeholders})",
+                [scorer] + batch
+            )
+            scores.update(c.fetchall())
+    return scores
+
+def save_sentiment_scores(scores, scorer):
+    """Store polarity per content hash for one scorer version"""
+    with sqlite3.connect(DB_PATH) as conn:
+        c = conn.cursor()
+        c.executemany(
+            "INSERT OR REPLACE INTO sentiment_cache (content_hash, scorer, polarity) VALUES (?, ?, ?)",
+            [(content_hash, scorer, float(polarity)) for content_hash, polarity in scores.items()]
+        )
+        conn.commit()
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import logging
+import importlib.util
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache")
+# Batas total ukuran cache di disk (MB), entri terlama dihapus lebih dulu
+CACHE_MAX_BYTES = int(os.getenv("DATASET_CACHE_MAX_MB", "2048")) * 1024 * 1024
+# Naikkan jika logika parsing/validasi berubah agar cache lama tidak dipakai
+CACHE_VERSION = 5
+
+logger = logging.getLogger(__name__)
+
+def is_available():
+    """Parquet cache needs pyarrow"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+def content_hash(uploaded_file, *extra):
+    """Hash the upload bytes (plus any read options) into a cache key"""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for part in extra:
+        h.update(str(part).encode())
+    if hasattr(uploaded_file, 'getbuffer'):
+        h.update(uploaded_file.getbuffer())
+    else:
+        uploaded_file.seek(0)
+        for block in iter(lambda: uploaded_file.read(1 << 20), b''):
+            h.update(block)
+        uploaded_file.seek(0)
+    return h.hexdigest()
+
+def _paths(key):
+    return (
+        os.path.join(CACHE_DIR, f"{key}.parquet"),
+        os.path.join(CACHE_DIR, f"{key}.json")
+    )
+
+def exists(key):
+    """Whether a complete cache entry is on disk"""
+    return all(os.path.exists(path) for path in _paths(key))
+
+def _read_parquet(path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    # Pertahankan kolom teks sebagai string berbasis Arrow
+    string_types = {pa.string(): pd.StringDtype('pyarrow'), pa.large_string(): pd.StringDtype('pyarrow')}
+    return pq.read_table(path).to_pandas(types_mapper=string_types.get)
+
+def load(key):
+    """Return (df, profile) for a cached dataset, or None on a miss"""
+    data_path, profile_path = _paths(key)
+    if not is_available() or not exists(key):
+        return None
+    try:
+        df = _read_parquet(data_path)
+        with open(profile_path) as f:
+            profile = json.load(f)
+    except Exception as e:
+        logger.warning(f"Cache dataset {key[:12]} rusak, diabaikan: {str(e)}")
+        return None
+    # Tandai sebagai baru dipakai untuk eviksi LRU
+    os.utime(data_path)
+    os.utime(profile_path)
+    logger.info(f"Cache hit dataset {key[:12]} ({len(df)} baris)")
+    return df, profile
+
+def save(key, df, profile):
+    """Store a cleaned dataset and its profile, then enforce the size cap"""
+    if not is_available():
+        return False
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    data_path, profile_path = _paths(key)
+    try:
+        df.to_parquet(f"{data_path}.tmp", index=False)
+        os.replace(f"{data_path}.tmp", data_path)
+        with open(f"{profile_path}.tmp", 'w') as f:
+            json.dump(profile, f, default=str)
+        os.replace(f"{profile_path}.tmp", profile_path)
+    except Exception as e:
+        logger.warning(f"Gagal menyimpan cache dataset: {str(e)}")
+        return False
+    evict()
+    return True
+
+def aux_path(key, name):
+    """Path of an auxiliary file stored next to a dataset (evicted together with it)"""
+    return os.path.join(CACHE_DIR, f"{key}.{name}")
+
+def _frame_path(key, name):
+    return aux_path(key, f"{name}.parquet")
+
+def load_frame(key, name):
+    """Return an auxiliary frame stored next to a dataset (e.g. its rollup cube), or None"""
+    path = _frame_path(key, name)
+    if not is_available() or not os.path.exists(path):
+        return None
+    try:
+        frame = _read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Cache {name} dataset {key[:12]} rusak, diabaikan: {str(e)}")
+        return None
+    os.utime(path)
+    return frame
+
+def save_frame(key, name, frame):
+    """Store an auxiliary frame for a dataset; evicted together with it"""
+    if not is_available():
+        return False
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _frame_path(key, name)
+    try:
+        frame.to_parquet(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+    except Exception as e:
+        logger.warning(f"Gagal menyimpan cache {name} dataset: {str(e)}")
+        return False
+    evict()
+    return True
+
+def evict():
+    """Drop least recently used entries until the cache fits CACHE_MAX_BYTES"""
+    # Semua file satu dataset (data, profil, frame tambahan) dihitung sebagai satu entri
+    entries = {}
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.tmp'):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        paths, mtime, size = entries.get(name.split('.')[0], ([], 0, 0))
+        entries[name.split('.')[0]] = (paths + [path], max(mtime, os.path.getmtime(path)), size + os.path.getsize(path))
+
+    total = sum(size for _, _, size in entries.values())
+    for key, (paths, _, size) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= CACHE_MAX_BYTES:
+            break
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        total -= size
+        logger.info(f"Cache dataset dihapus (LRU): {key[:12]}")
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Kolom kategori yang bisa difilter lewat indeks posisi
+FILTER_COLUMNS = ['source', 'sentiment']
+
+def _codes(series):
+    """Integer code per row (-1 for missing) and the value behind each code"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+class DatasetIndex:
+    """
+    Row-position indexes for filtering without boolean scans.
+
+    Dates are kept as a sorted index (a range is two binary searches) and
+    every source/sentiment value has its own sorted position array. A
+    filter starts from the smallest matching position set and checks the
+    other conditions only on those positions.
+    """
+
+    def __init__(self, df):
+        days = df['day'] if 'day' in df.columns else pd.to_datetime(df['date'], errors='coerce').dt.normalize()
+        # NaT menjadi int64 minimum, jadi selalu di luar rentang tanggal mana pun
+        self._days = days.to_numpy(dtype='datetime64[ns]').view('int64')
+        self._date_order = np.argsort(self._days, kind='stable')
+        self._sorted_days = self._days[self._date_order]
+        self._codes = {}
+        self._positions = {}
+        for col in FILTER_COLUMNS:
+            if col not in df.columns:
+                continue
+            codes, values = _codes(df[col])
+            # Argsort stabil: posisi tiap nilai tetap terurut naik
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes >= 0], minlength=len(values))
+            missing = len(codes) - counts.sum()
+            groups = np.split(order[missing:], np.cumsum(counts)[:-1])
+            self._codes[col] = (codes, {str(value): code for code, value in enumerate(values)})
+            self._positions[col] = groups
+
+    def _date_bounds(self, start, end):
+        return pd.Timestamp(start).value, pd.Timestamp(end).value
+
+    def date_positions(self, start, end):
+        """Positions of rows whose day lies in [start, end]"""
+        low, high = self._date_bounds(start, end)
+        lo = np.searchsorted(self._sorted_days, low, side='left')
+        hi = np.searchsorted(self._sorted_days, high, side='right')
+        return np.sort(self._date_order[lo:hi])
+
+    def _value_codes(self, column, values):
+        lookup = self._codes.get(column, (None, {}))[1]
+        return [lookup[value] for value in values if value in lookup]
+
+    def value_positions(self, column, values):
+        """Positions of rows whose column holds any of values"""
+        parts = [self._positions[column][code] for code in self._value_codes(column, values)]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        # Posisi antar nilai tidak pernah beririsan, cukup digabung lalu diurutkan
+        return np.sort(np.concatenate(parts))
+
+    def select(self, date_range=None, **values):
+        """Sorted positions matching every given filter, or None if no filter is set"""
+        conditions = []
+        if date_range:
+            low, high = self._date_bounds(*date_range)
+            size = np.searchsorted(self._sorted_days, high, side='right') - np.searchsorted(self._sorted_days, low, side='left')
+            conditions.append((size, 'date', date_range))
+        for column, chosen in values.items():
+            if chosen:
+                codes = self._value_codes(column, chosen)
+                size = sum(len(self._positions[column][code]) for code in codes)
+                conditions.append((size, column, chosen))
+        if not conditions:
+            return None
+
+        # Ambil himpunan posisi terkecil, syarat lain dicek hanya pada posisi tersebut
+        conditions.sort(key=lambda condition: condition[0])
+        _, column, chosen = conditions[0]
+        positions = self.date_positions(*chosen) if column == 'date' else self.value_positions(column, chosen)
+        for _, column, chosen in conditions[1:]:
+            if column == 'date':
+                low, high = self._date_bounds(*chosen)
+                days = self._days[positions]
+                positions = positions[(days >= low) & (days <= high)]
+            elif column not in self._codes:
+                positions = positions[:0]
+            else:
+                codes, _ = self._codes[column]
+                accepted = np.zeros(len(self._positions[column]), dtype=bool)
+                accepted[self._value_codes(column, chosen)] = True
+                row_codes = codes[positions]
+                positions = positions[(row_codes >= 0) & accepted[row_codes]]
+        return positions
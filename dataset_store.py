@@ -0,0 +1,56 @@
+import os
+import logging
+import streamlit as st
+import dataset_cache
+import database
+
+logger = logging.getLogger(__name__)
+
+# Jumlah dataset yang disimpan di memori proses, dipakai bersama oleh semua sesi
+SHARED_DATASETS = int(os.getenv("SHARED_DATASETS", "4"))
+
+class DatasetMissing(KeyError):
+    """Raised when a registered dataset has no file on disk"""
+
+@st.cache_resource(max_entries=SHARED_DATASETS, show_spinner=False)
+def _load_shared(dataset_id):
+    # Exception tidak di-cache, jadi dataset yang baru disimpan tetap bisa dimuat nanti
+    loaded = dataset_cache.load(dataset_id)
+    if loaded is None:
+        raise DatasetMissing(dataset_id)
+    logger.info(f"Dataset {dataset_id[:12]} dimuat ke memori bersama")
+    return loaded
+
+def load(dataset_id):
+    """
+    Return the shared (df, profile) for a dataset id, or None if unknown.
+
+    Every session asking for the same id gets the same DataFrame object,
+    so callers must treat it as read-only (see DatasetView).
+    """
+    try:
+        return _load_shared(dataset_id)
+    except DatasetMissing:
+        return None
+
+def register(dataset_id, name, rows, created_by=None):
+    """Publish a cached dataset in the server-side registry"""
+    if not dataset_cache.exists(dataset_id):
+        return False
+    database.save_dataset(dataset_id, name, rows, created_by)
+    return True
+
+def list_datasets():
+    """Registered datasets whose files are still on disk; stale entries are dropped"""
+    datasets = []
+    for entry in database.get_datasets():
+        if dataset_cache.exists(entry['id']):
+            datasets.append(entry)
+        else:
+            # File sudah terhapus oleh eviksi LRU cache
+            database.delete_dataset(entry['id'])
+    return datasets
+
+def remove(dataset_id):
+    """Unregister a dataset; sessions already using it keep their copy"""
+    database.delete_dataset(dataset_id)
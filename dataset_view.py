@@ -0,0 +1,187 @@
+import uuid
+import pandas as pd
+import streamlit as st
+import utils
+import rollup
+import dataset_cache
+import text_features
+from dataset_index import DatasetIndex
+
+# Frekuensi periode yang didukung: harian, mingguan, bulanan
+PERIOD_FREQS = ['D', 'W', 'M']
+
+class DatasetView:
+    """
+    Read-only view over the session dataset.
+
+    Tabs read `view.df` directly instead of copying it, so they must never
+    mutate it. Derived period keys are computed once per dataset and shared
+    by every tab and rerun.
+    """
+
+    def __init__(self, df, version=None, profile=None, cube=None, cache_key=None, features=None):
+        self._df = df
+        self.version = version
+        # Identitas isi view untuk cache hasil turunan (grafik, dll.)
+        self.cache_key = cache_key or version or uuid.uuid4().hex
+        self._profile = profile
+        self._cube = cube
+        self._features = features
+        self._periods = {}
+        self._index = None
+        self._filtered = None
+
+    @property
+    def df(self):
+        return self._df
+
+    @property
+    def columns(self):
+        return self._df.columns
+
+    def __len__(self):
+        return len(self._df)
+
+    @property
+    def profile(self):
+        """Dashboard profile of the rows in this view (rebuilt if missing or outdated)"""
+        if not utils.profile_is_current(self._profile):
+            self._profile = {**(self._profile or {}), **utils.generate_data_profile(self._df)}
+        return self._profile
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = DatasetIndex(self._df)
+        return self._index
+
+    def filtered(self, filters):
+        """
+        View restricted to the rows matching filters, found by index intersection.
+
+        The cube is filtered cell-wise (every filter is a cube dimension),
+        and the last filtered view is kept so reruns reuse it.
+        """
+        key = (filters['date_range'], tuple(filters['source']), tuple(filters['sentiment']))
+        if self._filtered is not None and self._filtered[0] == key:
+            return self._filtered[1]
+        positions = self.index.select(filters['date_range'], source=filters['source'], sentiment=filters['sentiment'])
+        cube = self.cube
+        if cube is not None:
+            mask = pd.Series(True, index=cube.index)
+            if filters['date_range']:
+                mask &= cube['day'].between(*[pd.Timestamp(d) for d in filters['date_range']])
+            for col in ['source', 'sentiment']:
+                if filters[col] and col in cube.columns:
+                    mask &= cube[col].astype(str).isin(filters[col])
+            cube = cube[mask]
+        # Fitur teks yang sudah ada cukup diambil barisnya, tanpa tokenisasi ulang
+        features = self._features.subset(positions) if self._features is not None else None
+        # Versi None: view terfilter tidak boleh dibaca dari file Parquet dataset utuh
+        view = DatasetView(self._df.take(positions), version=None, cube=cube, cache_key=f"{self.cache_key}|{key!r}", features=features)
+        self._filtered = (key, view)
+        return view
+
+    @property
+    def cube(self):
+        """Rollup cube of the dataset: stored at ingest, rebuilt from rows only if missing"""
+        if self._cube is None:
+            cube = dataset_cache.load_frame(self.version, 'cube') if self.version else None
+            if cube is None and 'date' in self._df.columns:
+                cube = rollup.build(self._df, utils.metric_columns(self._df))
+            self._cube = cube
+        return self._cube
+
+    @property
+    def features(self):
+        """Text features of `content`: stored per dataset version, built on first use"""
+        if self._features is None:
+            features = text_features.load(self.version) if self.version else None
+            if features is None:
+                features = text_features.build(self._df['content'])
+                if self.version:
+                    text_features.save(self.version, features)
+            self._features = features
+        return self._features
+
+    def period(self, freq='D', column='date'):
+        """Period start timestamps for every row (NaT for unparseable dates)"""
+        if freq not in PERIOD_FREQS:
+            raise ValueError(f"Frekuensi periode tidak dikenal: {freq}")
+        key = (column, freq)
+        if key not in self._periods:
+            if freq == 'D' and column == 'date' and 'day' in self._df.columns:
+                periods = self._df['day']
+            else:
+                dates = self._df[column]
+                if not pd.api.types.is_datetime64_any_dtype(dates):
+                    dates = pd.to_datetime(dates, errors='coerce')
+                if freq == 'D':
+                    periods = dates.dt.normalize()
+                else:
+                    periods = dates.dt.to_period(freq).dt.start_time
+            self._periods[key] = periods.rename('period')
+        return self._periods[key]
+
+    def period_sum(self, freq, date_column, metric_column, category_column=None):
+        """
+        Sum of metric_column per period (and category) over the raw rows,
+        as a tidy DataFrame sorted by period. For groupings the rollup
+        cube cannot answer.
+        """
+        # Baris dengan tanggal tidak valid (NaT) otomatis diabaikan oleh groupby
+        keys = [self.period(freq, date_column)]
+        if category_column:
+            keys.append(self._df[category_column])
+        result = self._df[metric_column].groupby(keys, observed=True).sum().reset_index()
+        return result.sort_values('period', kind='stable').reset_index(drop=True)
+
+def get_view(filtered=True):
+    """
+    Return the shared view of st.session_state.df, or None without data.
+
+    The sidebar filters are applied unless filtered=False.
+    """
+    df = st.session_state.get('df')
+    if df is None:
+        return None
+    view = st.session_state.get('dataset_view')
+    if view is None or view.df is not df:
+        view = DatasetView(df, st.session_state.get('dataset_key'), st.session_state.get('data_profile'))
+        st.session_state.dataset_view = view
+    filters = st.session_state.get('dataset_filters')
+    if filtered and filters:
+        return view.filtered(filters)
+    return view
+
+def filter_panel():
+    """Sidebar filters (date range, source, sentiment) applied to every tab"""
+    view = get_view(filtered=False)
+    if view is None:
+        st.session_state.dataset_filters = None
+        return
+    profile = view.profile
+    # Kunci widget mengikuti versi dataset agar pilihan lama tidak terbawa ke dataset baru
+    suffix = view.version or id(view.df)
+    st.markdown("**🔎 Filter Data**")
+    date_range = None
+    if profile['date_range']:
+        first = pd.Timestamp(profile['date_range']['min']).date()
+        last = pd.Timestamp(profile['date_range']['max']).date()
+        picked = st.date_input("Rentang tanggal", (first, last), min_value=first, max_value=last, key=f"filter_dates_{suffix}")
+        if isinstance(picked, (list, tuple)) and len(picked) == 2 and tuple(picked) != (first, last):
+            date_range = tuple(picked)
+    sources = st.multiselect(
+        "Sumber", sorted(profile['source_counts'], key=profile['source_counts'].get, reverse=True),
+        key=f"filter_sources_{suffix}", placeholder="Semua sumber"
+    )
+    sentiments = st.multiselect(
+        "Sentimen", list(profile['sentiment_counts']),
+        key=f"filter_sentiments_{suffix}", placeholder="Semua sentimen"
+    )
+    if date_range or sources or sentiments:
+        st.session_state.dataset_filters = {'date_range': date_range, 'source': sources, 'sentiment': sentiments}
+        filtered = view.filtered(st.session_state.dataset_filters)
+        st.caption(f"Menampilkan {len(filtered):,} dari {len(view):,} baris")
+    else:
+        st.session_state.dataset_filters = None
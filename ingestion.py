@@ -0,0 +1,427 @@
+import logging
+import re
+import numpy as np
+import pandas as pd
+import openpyxl
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+# Skema data berita: satu sumber untuk kolom wajib, alias, dtype dan nilai valid
+NEWS_SCHEMA = {
+    'required': ['date', 'title', 'sentiment', 'source', 'content'],
+    'optional': ['category', 'sentiment_score', 'count'],
+    'aliases': {
+        'tanggal': 'date',
+        'judul': 'title',
+        'sentimen': 'sentiment',
+        'sumber': 'source',
+        'isi': 'content',
+        'kategori': 'category'
+    },
+    'dtypes': {
+        'date': 'datetime',
+        'source': 'category',
+        'sentiment': 'category',
+        'category': 'category',
+        'sentiment_score': 'numeric',
+        'count': 'numeric'
+    },
+    'lowercase': ['sentiment'],
+    'allowed_values': {
+        'sentiment': ['positif', 'negatif', 'netral']
+    }
+}
+
+# Jumlah contoh posisi baris yang disimpan per jenis masalah
+MAX_ISSUE_EXAMPLES = 5
+
+# Jumlah baris per chunk saat membaca CSV
+CSV_CHUNK_SIZE = 100_000
+
+# Jumlah baris per chunk saat membaca JSONL
+JSONL_CHUNK_SIZE = 100_000
+
+# Format yang dibaca bertahap; format lain (Parquet, Feather, .xls) dibaca sekaligus
+STREAMED_EXTENSIONS = ('.csv', '.jsonl', '.xlsx')
+
+# Interval baris untuk update progress saat membaca Excel
+EXCEL_PROGRESS_EVERY = 10_000
+
+SUPPORTED_EXTENSIONS = ['csv', 'xlsx', 'xls', 'parquet', 'feather', 'jsonl']
+
+# Format tanggal kandidat, diuji berurutan (format hari-dulu didahulukan)
+DATE_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d %B %Y',
+    '%d %b %Y',
+    '%A, %d %B %Y',
+    '%B %d, %Y',
+    'ISO8601'
+]
+
+# Jumlah nilai unik yang diuji saat mendeteksi format tanggal
+DATE_SAMPLE_SIZE = 500
+
+# Nama bulan/hari Indonesia -> Inggris agar bisa dibaca strptime
+INDONESIAN_DATE_WORDS = {
+    'januari': 'January', 'februari': 'February', 'maret': 'March', 'april': 'April',
+    'mei': 'May', 'juni': 'June', 'juli': 'July', 'agustus': 'August',
+    'september': 'September', 'oktober': 'October', 'november': 'November', 'desember': 'December',
+    'agu': 'Aug', 'agt': 'Aug', 'okt': 'Oct', 'des': 'Dec',
+    'senin': 'Monday', 'selasa': 'Tuesday', 'rabu': 'Wednesday', 'kamis': 'Thursday',
+    'jumat': 'Friday', "jum'at": 'Friday', 'sabtu': 'Saturday', 'minggu': 'Sunday'
+}
+_DATE_WORD_PATTERN = re.compile(
+    r"\b(" + '|'.join(sorted(map(re.escape, INDONESIAN_DATE_WORDS), key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+def normalize_column_name(col, schema=NEWS_SCHEMA):
+    """Map a raw header to its canonical column name"""
+    col = str(col).strip().lower()
+    return schema['aliases'].get(col, col)
+
+def _categorical_columns(schema):
+    return [col for col, kind in schema['dtypes'].items() if kind == 'category']
+
+def _projected_columns(names, schema):
+    """Raw column names that map to a required or optional schema column"""
+    wanted = set(schema['required']) | set(schema['optional'])
+    return [name for name in names if normalize_column_name(name, schema) in wanted]
+
+def new_report():
+    """Empty validation report"""
+    return {'rows': 0, 'missing_columns': [], 'issues': {}, 'date_formats': {}}
+
+def _add_issue(report, name, invalid, offset=0):
+    """Record a boolean mask of invalid rows under an issue name"""
+    positions = np.flatnonzero(invalid)
+    if not len(positions):
+        return
+    issue = report['issues'].setdefault(name, {'count': 0, 'rows': []})
+    issue['count'] += int(len(positions))
+    room = MAX_ISSUE_EXAMPLES - len(issue['rows'])
+    if room > 0:
+        issue['rows'].extend((positions[:room] + offset).tolist())
+
+def _lower_categories(series):
+    """Lower-case a categorical via its categories, merging ones that collide"""
+    lowered = pd.Index(series.cat.categories.astype(str).str.lower())
+    if lowered.is_unique:
+        return series.cat.rename_categories(lowered)
+    category_codes, uniques = pd.factorize(lowered)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, category_codes[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=uniques), index=series.index, name=series.name)
+
+def _invalid_values(series, allowed):
+    """Boolean mask of values outside `allowed` (missing values count as invalid)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Cek sekali per kategori, lalu petakan lewat kode (kode -1 = NaN -> indeks terakhir = False)
+        valid = np.append(series.cat.categories.isin(allowed), False)
+        return ~valid[series.cat.codes.to_numpy()]
+    return ~series.isin(allowed).to_numpy()
+
+def _translate_date_words(values):
+    """Replace Indonesian month and day names with English ones"""
+    return values.str.replace(
+        _DATE_WORD_PATTERN, lambda m: INDONESIAN_DATE_WORDS[m.group(0).lower()], regex=True
+    )
+
+def detect_date_format(values, formats=DATE_FORMATS, sample_size=DATE_SAMPLE_SIZE):
+    """
+    Pick the candidate format that parses the largest share of a sample.
+
+    `values` are strings with Indonesian names already translated. Returns
+    (format, parsed_share); the first format that parses the whole sample wins.
+    """
+    sample = values.dropna()
+    if len(sample) > sample_size:
+        sample = sample.sample(sample_size, random_state=0)
+    if sample.empty:
+        return formats[0], 0.0
+    best_format, best_share = formats[0], -1.0
+    for fmt in formats:
+        share = pd.to_datetime(sample, format=fmt, errors='coerce').notna().mean()
+        if share > best_share:
+            best_format, best_share = fmt, share
+        if share == 1.0:
+            break
+    return best_format, float(best_share)
+
+def _naive(parsed):
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        return parsed.dt.tz_convert(None)
+    return parsed
+
+def parse_dates(series, fmt=None):
+    """
+    Parse a date column with one explicit format in a single vectorized pass.
+
+    Values are factorized first, so each distinct date string is translated
+    and parsed once no matter how many rows share it. The format is sniffed
+    when not given. Values that are already dates (e.g. Excel datetime
+    cells) are converted directly, so a column may mix both. Returns
+    (parsed, format), the format being None when no text had to be parsed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _naive(series), None
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+    is_text = uniques.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    if not is_text.all():
+        # Nilai bukan teks (mis. datetime dari Excel) dibaca langsung oleh pandas
+        parsed[~is_text] = _naive(pd.to_datetime(uniques[~is_text], errors='coerce')).to_numpy(dtype='datetime64[ns]')
+    if is_text.any():
+        text = _translate_date_words(uniques[is_text].astype(str).str.strip())
+        if fmt is None:
+            fmt, _ = detect_date_format(text)
+        parsed[is_text] = _naive(pd.to_datetime(text, format=fmt, errors='coerce')).to_numpy(dtype='datetime64[ns]')
+    values = parsed.to_numpy()
+    values = np.append(values, np.datetime64('NaT'))[codes]
+    return pd.Series(values, index=series.index, name=series.name), fmt
+
+def validate(df, schema=NEWS_SCHEMA, report=None, offset=0):
+    """
+    Rename, coerce and validate a frame against a schema.
+
+    Every schema column is touched once: categoricals are lower-cased and
+    checked on their categories instead of per row. Issues accumulate into
+    `report`, with row positions shifted by `offset` for chunked reads.
+    Returns (df, report); missing required columns end up in
+    report['missing_columns'].
+    """
+    if report is None:
+        report = new_report()
+    df.columns = [normalize_column_name(col, schema) for col in df.columns]
+
+    missing_columns = [col for col in schema['required'] if col not in df.columns]
+    if missing_columns:
+        report['missing_columns'] = missing_columns
+        return df, report
+    report['rows'] += len(df)
+
+    for col, kind in schema['dtypes'].items():
+        if col not in df.columns:
+            continue
+        if kind == 'datetime':
+            # Format yang terdeteksi di chunk pertama dipakai untuk chunk berikutnya
+            known = report['date_formats'].get(col, {})
+            df[col], fmt = parse_dates(df[col], known.get('format'))
+            failed = df[col].isna().to_numpy()
+            _add_issue(report, f'invalid_{col}', failed, offset)
+            if fmt is None or failed.all():
+                # Hanya format strptime yang dikunci; chunk tanpa teks tanggal
+                # atau tanpa tanggal valid tidak boleh mengubahnya
+                fmt = known.get('format')
+            report['date_formats'][col] = {'format': fmt, 'failed': known.get('failed', 0) + int(failed.sum())}
+        elif kind == 'category':
+            series = df[col]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+            if col in schema.get('lowercase', []):
+                series = _lower_categories(series)
+            df[col] = series
+        elif kind == 'numeric':
+            coerced = pd.to_numeric(df[col], errors='coerce')
+            _add_issue(report, f'invalid_{col}', (coerced.isna() & df[col].notna()).to_numpy(), offset)
+            df[col] = coerced
+
+    for col, allowed in schema.get('allowed_values', {}).items():
+        if col in df.columns:
+            _add_issue(report, f'invalid_{col}', _invalid_values(df[col], allowed), offset)
+
+    return df, report
+
+def concat_frames(frames):
+    """Concatenate frames, unifying categorical columns so they stay categorical"""
+    columns = list(frames[0].columns)
+    categorical = [
+        col for col in columns
+        if all(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    if len(frames) == 1 or not categorical:
+        return pd.concat(frames, ignore_index=True)
+    # Input tidak diubah: kolom category digabung terpisah lalu disisipkan kembali
+    merged = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for col in categorical:
+        values = union_categoricals([frame[col] for frame in frames])
+        merged.insert(min(columns.index(col), len(merged.columns)), col, values)
+    return merged
+
+def read_csv_chunked(uploaded_file, schema=NEWS_SCHEMA, chunksize=CSV_CHUNK_SIZE, progress_callback=None):
+    """
+    Read and validate a CSV upload in bounded chunks.
+
+    Low-cardinality columns are parsed straight into categoricals, so peak
+    memory stays a small multiple of the chunk size. Returns (df, report).
+    """
+    report = new_report()
+    header = pd.read_csv(uploaded_file, nrows=0).columns
+    uploaded_file.seek(0)
+    canonical = {normalize_column_name(col, schema) for col in header}
+    report['missing_columns'] = [col for col in schema['required'] if col not in canonical]
+    if report['missing_columns']:
+        return None, report
+
+    categorical = _categorical_columns(schema)
+    dtype = {col: 'category' for col in header if normalize_column_name(col, schema) in categorical}
+    total_size = getattr(uploaded_file, 'size', None)
+    chunks = []
+    for chunk in pd.read_csv(uploaded_file, chunksize=chunksize, dtype=dtype):
+        chunk, report = validate(chunk, schema, report, offset=report['rows'])
+        chunks.append(chunk)
+        if progress_callback and total_size:
+            progress_callback(min(uploaded_file.tell() / total_size, 1.0))
+
+    df = concat_frames(chunks)
+    logger.info(f"CSV dibaca dalam {len(chunks)} chunk ({len(df)} baris)")
+    return df, report
+
+def read_jsonl_chunked(uploaded_file, schema=NEWS_SCHEMA, chunksize=JSONL_CHUNK_SIZE, progress_callback=None):
+    """
+    Read and validate newline-delimited JSON in bounded chunks.
+
+    JSON has no schema to project against up front, so unmapped columns are
+    dropped from each chunk as soon as it is parsed. Returns (df, report).
+    """
+    report = new_report()
+    total_size = getattr(uploaded_file, 'size', None)
+    chunks = []
+    with pd.read_json(uploaded_file, lines=True, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk = chunk[_projected_columns(chunk.columns, schema)]
+            chunk, report = validate(chunk, schema, report, offset=report['rows'])
+            if report['missing_columns']:
+                return None, report
+            chunks.append(chunk)
+            if progress_callback and total_size:
+                progress_callback(min(uploaded_file.tell() / total_size, 1.0))
+
+    if not chunks:
+        report['missing_columns'] = list(schema['required'])
+        return None, report
+    return concat_frames(chunks), report
+
+def list_excel_sheets(uploaded_file):
+    """Sheet names of an .xlsx upload, without parsing any cells"""
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+        uploaded_file.seek(0)
+
+def read_excel_streaming(uploaded_file, sheet_name=None, schema=NEWS_SCHEMA, progress_callback=None):
+    """
+    Stream an .xlsx sheet row by row into per-column buffers.
+
+    Uses openpyxl's read-only mode so the workbook object model is never
+    built; categorical columns are encoded as soon as the sheet is read.
+    """
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        header = [name if name is not None else f"unnamed_{i}" for i, name in enumerate(header)]
+        n_cols = len(header)
+        buffers = [[] for _ in range(n_cols)]
+        total_rows = sheet.max_row
+
+        for i, row in enumerate(rows, 1):
+            if all(value is None for value in row):
+                continue
+            if len(row) < n_cols:
+                row = row + (None,) * (n_cols - len(row))
+            for buffer, value in zip(buffers, row):
+                buffer.append(value)
+            if progress_callback and total_rows and i % EXCEL_PROGRESS_EVERY == 0:
+                progress_callback(min(i / total_rows, 1.0))
+    finally:
+        workbook.close()
+
+    categorical = _categorical_columns(schema)
+    df = pd.DataFrame({
+        i: pd.Categorical(buffer) if normalize_column_name(name, schema) in categorical else buffer
+        for i, (name, buffer) in enumerate(zip(header, buffers))
+    })
+    df.columns = header
+    return df
+
+def read_columnar(uploaded_file, schema=NEWS_SCHEMA):
+    """Read a Parquet or Feather upload, loading only the mapped columns"""
+    if uploaded_file.name.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        columns = _projected_columns(pq.read_schema(uploaded_file).names, schema)
+        uploaded_file.seek(0)
+        return pd.read_parquet(uploaded_file, columns=columns)
+    import pyarrow as pa
+    columns = _projected_columns(pa.ipc.open_file(uploaded_file).schema.names, schema)
+    uploaded_file.seek(0)
+    return pd.read_feather(uploaded_file, columns=columns)
+
+def is_streamed(name):
+    """Whether a file is read in chunks (progress and cancellation during the read)"""
+    return name.endswith(STREAMED_EXTENSIONS)
+
+def ingest(uploaded_file, schema=NEWS_SCHEMA, chunksize=CSV_CHUNK_SIZE, progress_callback=None, sheet_name=None):
+    """
+    Read and validate an upload of any supported format.
+
+    Returns (df, report). df is None when required columns are missing;
+    raises ValueError for unsupported file formats.
+    """
+    name = uploaded_file.name
+    if name.endswith('.csv'):
+        return read_csv_chunked(uploaded_file, schema, chunksize=chunksize, progress_callback=progress_callback)
+    if name.endswith('.jsonl'):
+        return read_jsonl_chunked(uploaded_file, schema, progress_callback=progress_callback)
+
+    if name.endswith('.xlsx'):
+        df = read_excel_streaming(uploaded_file, sheet_name=sheet_name, schema=schema, progress_callback=progress_callback)
+    elif name.endswith('.xls'):
+        # Format lama tidak didukung openpyxl read-only, gunakan pandas
+        df = pd.read_excel(uploaded_file, sheet_name=sheet_name or 0)
+    elif name.endswith(('.parquet', '.feather')):
+        df = read_columnar(uploaded_file, schema)
+    else:
+        raise ValueError("Format file tidak didukung. Gunakan CSV, Excel, Parquet, Feather atau JSONL.")
+
+    # Format ini dibaca sekaligus; pembatalan baru bisa dicek setelah pembacaan selesai
+    if progress_callback:
+        progress_callback(0.5)
+    df, report = validate(df, schema)
+    if progress_callback:
+        progress_callback(1.0)
+    if report['missing_columns']:
+        return None, report
+    return df, report
+
+def describe_issues(report, schema=NEWS_SCHEMA):
+    """Human-readable (Indonesian) summary lines for a validation report"""
+    # Nama kolom ditampilkan dengan alias Indonesianya jika ada
+    labels = {canonical: alias for alias, canonical in schema['aliases'].items()}
+    messages = []
+    for name, issue in report['issues'].items():
+        col = name[len('invalid_'):]
+        label = labels.get(col, col)
+        if col in schema.get('allowed_values', {}):
+            allowed = ', '.join(value.capitalize() for value in schema['allowed_values'][col])
+            messages.append(f"Terdapat {issue['count']} {label} tidak valid. Hanya gunakan: {allowed}")
+        elif schema['dtypes'].get(col) == 'datetime':
+            messages.append(f"Terdapat {issue['count']} baris dengan {label} tidak valid")
+        else:
+            messages.append(f"Terdapat {issue['count']} nilai {label} yang bukan angka")
+    return messages
@@ -0,0 +1,196 @@
+import os
+import hashlib
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+import utils
+import ingestion
+import dataset_cache
+import dataset_store
+import rollup
+import text_features
+
+logger = logging.getLogger(__name__)
+
+# Worker bersama untuk semua sesi; parsing berat tidak menahan thread script runner
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+
+class IngestCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled"""
+
+class IngestJob:
+    """Handle for one background ingestion run, kept in st.session_state"""
+
+    def __init__(self, name, upload_id, dataset_key, mode='replace'):
+        self.name = name
+        self.upload_id = upload_id
+        self.dataset_key = dataset_key
+        self.mode = mode
+        self.progress = 0.0
+        self.stage = "Menunggu worker"
+        self.started_at = time.time()
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def update(self, progress, stage=None):
+        """Progress hook called from the worker; aborts the job once cancelled"""
+        if self._cancel_event.is_set():
+            raise IngestCancelled()
+        self.progress = progress
+        if stage:
+            self.stage = stage
+
+    def cancel(self):
+        self._cancel_event.set()
+        self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def done(self):
+        return self.future.done()
+
+def load_dataset(uploaded_file, dataset_key, sheet_name=None, progress_callback=None):
+    """
+    Full upload pipeline: parse and validate, compact dtypes, profile, cache.
+
+    Safe to run off the script thread (no st.* calls). Returns
+    (df, profile, error).
+    """
+    def report_progress(progress, stage):
+        if progress_callback:
+            progress_callback(progress, stage)
+
+    try:
+        df, report = ingestion.ingest(
+            uploaded_file,
+            progress_callback=lambda p: report_progress(p * 0.8, "Membaca data"),
+            sheet_name=sheet_name
+        )
+    except IngestCancelled:
+        raise
+    except Exception as e:
+        return None, None, f"Error memproses file: {str(e)}"
+    if report['missing_columns']:
+        return None, None, f"Kolom wajib tidak ditemukan: {', '.join(report['missing_columns'])}"
+
+    report_progress(0.85, "Mengoptimalkan memori")
+    df, memory_report = utils.optimize_dtypes(df)
+    df['row_key'] = utils.row_keys(df)
+    report_progress(0.9, "Menyusun profil dan rollup")
+    profile = utils.generate_data_profile(df)
+    profile['memory'] = memory_report
+    profile['validation'] = report
+    cube = rollup.build(df, utils.metric_columns(df))
+    report_progress(0.95, "Menyimpan cache")
+    dataset_cache.save(dataset_key, df, profile)
+    dataset_cache.save_frame(dataset_key, 'cube', cube)
+    report_progress(1.0, "Selesai")
+    return df, profile, None
+
+def _run(job, uploaded_file, sheet_name):
+    start = time.perf_counter()
+    result = load_dataset(uploaded_file, job.dataset_key, sheet_name, progress_callback=job.update)
+    logger.info(f"Ingestion '{job.name}' selesai dalam {time.perf_counter() - start:.2f}s")
+    return result
+
+def submit(uploaded_file, upload_id, dataset_key, sheet_name=None, mode='replace'):
+    """Start ingesting an upload in the background, replacing any running job"""
+    previous = active_job()
+    if previous is not None:
+        previous.cancel()
+    job = IngestJob(uploaded_file.name, upload_id, dataset_key, mode)
+    job.future = _executor.submit(_run, job, uploaded_file, sheet_name)
+    st.session_state.ingest_job = job
+    st.session_state.ingest_error = None
+    return job
+
+def active_job():
+    """The session's ingestion job, if one is still registered"""
+    return st.session_state.get('ingest_job')
+
+def apply_result(upload_id, dataset_key, df, profile):
+    """Make a loaded dataset the session dataset"""
+    st.session_state.df = df
+    st.session_state.data_profile = profile
+    st.session_state.dataset_key = dataset_key
+    st.session_state.upload_file_id = upload_id
+
+def append_result(upload_id, dataset_key, new_df, new_profile):
+    """
+    Append a loaded dataset to the session dataset, skipping known rows.
+
+    Only the new rows are profiled; their counts are folded into the
+    existing profile instead of re-profiling the whole frame.
+    """
+    merged, fresh = utils.append_rows(st.session_state.df, new_df)
+    profile = utils.update_data_profile(st.session_state.data_profile, fresh)
+    profile.pop('memory', None)
+    profile['validation'] = new_profile.get('validation')
+    profile['appended'] = {'rows': len(fresh), 'duplicates': len(new_df) - len(fresh)}
+    merged_key = hashlib.sha256(f"{st.session_state.dataset_key}+{dataset_key}".encode()).hexdigest()
+    # Cube hasil gabungan cukup dari dua cube, tanpa mengagregasi ulang seluruh baris
+    view = st.session_state.get('dataset_view')
+    if view is not None and view.df is st.session_state.df and view.cube is not None:
+        cube = rollup.merge(view.cube, rollup.build(fresh, utils.metric_columns(fresh)))
+        dataset_cache.save_frame(merged_key, 'cube', cube)
+    # Fitur teks gabungan: jika dataset lama sudah punya fitur, cukup tokenisasi baris baru
+    features = text_features.load(st.session_state.dataset_key) if st.session_state.get('dataset_key') else None
+    if features is not None and len(features) == len(st.session_state.df):
+        text_features.save(merged_key, text_features.merge(features, text_features.build(fresh['content'])))
+    apply_result(upload_id, merged_key, merged, profile)
+    logger.info(f"Append: {len(fresh)} baris baru, {len(new_df) - len(fresh)} duplikat dilewati")
+
+def collect():
+    """Move a finished job's result into session state; call once per rerun"""
+    job = active_job()
+    if job is None or not job.done():
+        return
+    st.session_state.ingest_job = None
+    if job.cancelled:
+        st.session_state.ingest_error = (job.upload_id, "Pemuatan data dibatalkan.")
+        return
+    try:
+        df, profile, error = job.future.result()
+    except IngestCancelled:
+        st.session_state.ingest_error = (job.upload_id, "Pemuatan data dibatalkan.")
+        return
+    except Exception as e:
+        logger.exception("Ingestion gagal")
+        error = f"Error memproses file: {str(e)}"
+    if error:
+        st.session_state.ingest_error = (job.upload_id, error)
+        return
+    # Daftarkan ke registry server dan pakai salinan bersama, sesi lain tidak perlu parsing ulang
+    if dataset_store.register(job.dataset_key, job.name, len(df), st.session_state.get('user')):
+        df, profile = dataset_store.load(job.dataset_key) or (df, profile)
+    if job.mode == 'append' and st.session_state.df is not None:
+        append_result(job.upload_id, job.dataset_key, df, profile)
+    else:
+        apply_result(job.upload_id, job.dataset_key, df, profile)
+
+def loading_notice():
+    """Tell the user a dataset is still loading, if it is"""
+    job = active_job()
+    if job is not None:
+        st.info(f"⏳ Dataset **{job.name}** masih dimuat ({job.progress:.0%}). Tampilan akan diperbarui setelah selesai.")
+
+@st.experimental_fragment(run_every=1)
+def progress_panel():
+    """Sidebar progress and cancel control; polls until the job finishes"""
+    job = active_job()
+    if job is None:
+        return
+    if job.done():
+        st.rerun()
+    st.caption(f"📤 Memuat **{job.name}**")
+    st.progress(job.progress, text=f"{job.stage}... {job.progress:.0%} ({time.time() - job.started_at:.0f}s)")
+    if not ingestion.is_streamed(job.name):
+        st.caption("Format ini dibaca sekaligus: pembatalan berlaku setelah file selesai dibaca.")
+    if st.button("Batalkan", key="cancel_ingest", use_container_width=True):
+        job.cancel()
+        st.rerun()
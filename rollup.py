@@ -0,0 +1,75 @@
+import logging
+import pandas as pd
+import ingestion
+
+logger = logging.getLogger(__name__)
+
+# Dimensi cube; kolom yang tidak ada di dataset dilewati (kecuali day)
+CUBE_DIMENSIONS = ['day', 'source', 'sentiment', 'category']
+
+# Nama kolom jumlah baris di cube (bukan 'count', yang bisa jadi kolom metrik dataset)
+ROW_COUNT = 'rows'
+
+def dimensions(cube):
+    return [col for col in CUBE_DIMENSIONS if col in cube.columns]
+
+def metrics(cube):
+    return [col for col in cube.columns if col not in CUBE_DIMENSIONS]
+
+def _rollup(df, dims, value_columns):
+    # dropna=False agar jumlah baris cube tetap sama dengan total dataset
+    grouped = df.groupby(dims, observed=True, dropna=False, sort=False)
+    return grouped[value_columns].sum().reset_index()
+
+def _sum_dtype(dtype):
+    # Dijumlah dalam 64-bit agar kolom yang dipadatkan (int8, float32) tidak overflow;
+    # metrik bilangan bulat tetap bulat seperti groupby atas baris mentah
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'Int64' if isinstance(dtype, pd.api.extensions.ExtensionDtype) else 'int64'
+    return 'float64'
+
+def build(df, metric_columns=()):
+    """
+    Roll the dataset up to row counts and metric sums per (day, source,
+    sentiment, category).
+
+    Weekly and monthly buckets are derived from `day`, so every time
+    window and grouping the tabs offer can be answered from the cube.
+    """
+    days = df['day'] if 'day' in df.columns else pd.to_datetime(df['date'], errors='coerce').dt.normalize()
+    keys = [days.rename('day')] + [df[col] for col in CUBE_DIMENSIONS[1:] if col in df.columns]
+    values = df[list(metric_columns)].astype({col: _sum_dtype(df[col].dtype) for col in metric_columns})
+    values[ROW_COUNT] = 1
+    grouped = values.groupby(keys, observed=True, dropna=False, sort=False)
+    cube = grouped.sum().reset_index()
+    logger.info(f"Rollup cube: {len(df)} baris -> {len(cube)} sel")
+    return cube
+
+def merge(cube, new_cube):
+    """Fold the cube of appended rows into an existing cube"""
+    combined = ingestion.concat_frames([cube, new_cube])
+    return _rollup(combined, dimensions(combined), metrics(combined))
+
+def covers(cube, value, by=None):
+    """Whether a (value, by) aggregation can be answered from the cube"""
+    if cube is None or value not in metrics(cube):
+        return False
+    return by is None or by in dimensions(cube)
+
+def aggregate(cube, freq='D', value=ROW_COUNT, by=None):
+    """
+    Sum `value` per period (and per `by` value) from the cube.
+
+    Returns a tidy DataFrame with columns period, [by,] value sorted by
+    period; rows without a valid day or `by` value are left out, like a
+    groupby over the raw rows.
+    """
+    if freq == 'D':
+        periods = cube['day']
+    else:
+        periods = cube['day'].dt.to_period(freq).dt.start_time
+    keys = [periods.rename('period')]
+    if by:
+        keys.append(cube[by])
+    result = cube[value].groupby(keys, observed=True).sum().reset_index()
+    return result.sort_values('period', kind='stable').reset_index(drop=True)
@@ -0,0 +1,140 @@
+import os
+import time
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+import database
+import text_features
+
+logger = logging.getLogger(__name__)
+
+# Jumlah proses untuk scoring paralel (default: semua core)
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(os.cpu_count() or 1)))
+# Jumlah dokumen per batch yang dikirim ke satu proses
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "5000"))
+
+LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "lexicon_id.csv")
+
+class TextBlobScorer:
+    """TextBlob polarity (English lexicon), one TextBlob object per document"""
+
+    name = 'textblob'
+    version = 'textblob-1'
+
+    def score(self, texts):
+        from textblob import TextBlob
+        return np.array([TextBlob(text).sentiment.polarity for text in texts], dtype='float64')
+
+class LexiconScorer:
+    """
+    Polarity as the mean weight of the lexicon words found in a document.
+
+    The corpus is tokenized once into a sparse document-term matrix over
+    the lexicon vocabulary, so scoring is one matrix-vector product. The
+    default lexicon (data/lexicon_id.csv) is Indonesian; any CSV with
+    word and weight columns (weights in [-1, 1]) can be plugged in.
+    """
+
+    name = 'lexicon'
+    # Sudah vektorisasi penuh, process pool hanya menambah biaya pickling
+    parallel = False
+
+    def __init__(self, path=LEXICON_PATH):
+        with open(path, 'rb') as f:
+            # Versi mengikuti isi leksikon, jadi skor di cache ikut kedaluwarsa saat bobot berubah
+            digest = hashlib.md5(f.read()).hexdigest()[:8]
+        lexicon = pd.read_csv(path)
+        weights = lexicon.groupby(lexicon['word'].str.lower())['weight'].mean()
+        self.vectorizer = CountVectorizer(vocabulary=list(weights.index), token_pattern=r"(?u)\b\w+\b")
+        self.weights = weights.to_numpy(dtype='float64')
+        self.version = f"lexicon-{digest}"
+
+    def score(self, texts):
+        dtm = self.vectorizer.transform(texts)
+        matched = np.asarray(dtm.sum(axis=1), dtype='float64').ravel()
+        totals = dtm @ self.weights
+        return np.divide(totals, matched, out=np.zeros(len(texts)), where=matched > 0)
+
+SCORERS = {
+    'textblob': TextBlobScorer,
+    'lexicon': LexiconScorer
+}
+
+def get_scorer(scorer):
+    """Resolve a scorer name (see SCORERS) or pass a scorer instance through"""
+    if isinstance(scorer, str):
+        if scorer not in SCORERS:
+            raise ValueError(f"Scorer sentimen tidak dikenal: {scorer}")
+        return SCORERS[scorer]()
+    return scorer
+
+def score_documents(texts, scorer='textblob', batch_size=SENTIMENT_BATCH_SIZE, workers=SENTIMENT_WORKERS):
+    """
+    Score texts in batches, fanned out over a process pool.
+
+    Returns (scores, report) where report holds the document count,
+    elapsed seconds, docs/sec and the number of workers used. Small
+    inputs and vectorized scorers are scored in-process in one pass.
+    """
+    scorer = get_scorer(scorer)
+    texts = ["" if text is None else str(text) for text in texts]
+    if not getattr(scorer, 'parallel', True):
+        batch_size = max(len(texts), 1)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    workers = max(1, min(workers, len(batches)))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [scorer.score(batch) for batch in batches]
+    else:
+        # spawn, bukan fork: server Streamlit multithread dan fork hanya menyalin thread pemanggil
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(scorer.score, batches))
+    elapsed = time.perf_counter() - start
+
+    scores = np.concatenate(results) if results else np.zeros(0)
+    report = {
+        'docs': len(texts),
+        'seconds': elapsed,
+        'docs_per_sec': len(texts) / elapsed if elapsed else float('inf'),
+        'workers': workers,
+        'scorer': scorer.version
+    }
+    logger.info(f"Sentimen {scorer.name}: {report['docs']} dokumen, {report['docs_per_sec']:.0f} dok/detik, {workers} worker")
+    return scores, report
+
+def score_cached(texts, scorer='textblob', batch_size=SENTIMENT_BATCH_SIZE, workers=SENTIMENT_WORKERS):
+    """
+    score_documents backed by the sentiment_cache table in app_data.db.
+
+    Scores are keyed by content hash and scorer version, so only new or
+    changed texts (and each distinct text only once) are scored. The
+    report adds cache_hits and cache_misses, counted per document, and
+    the number of texts actually scored.
+    """
+    scorer = get_scorer(scorer)
+    texts = ["" if text is None else str(text) for text in texts]
+    # Hash yang sama dengan text_features, disimpan sebagai teks hex di SQLite
+    hashes = [f"{value:016x}" for value in text_features.content_hashes(texts)]
+    database.init_sentiment_cache()
+    cached = database.get_sentiment_scores(set(hashes), scorer.version)
+
+    missing = {}
+    for content, key in zip(texts, hashes):
+        if key not in cached and key not in missing:
+            missing[key] = content
+    new_scores, report = score_documents(list(missing.values()), scorer, batch_size, workers)
+    fresh = dict(zip(missing.keys(), new_scores))
+    if fresh:
+        database.save_sentiment_scores(fresh, scorer.version)
+    cached.update(fresh)
+
+    scores = np.array([cached[key] for key in hashes], dtype='float64')
+    hits = sum(key not in fresh for key in hashes)
+    report.update({'scored': report['docs'], 'docs': len(texts), 'cache_hits': hits, 'cache_misses': len(texts) - hits})
+    logger.info(f"Cache sentimen {scorer.name}: {hits} hit, {len(texts) - hits} miss")
+    return scores, report
@@ -0,0 +1,20 @@
+import pandas as pd
+
+import analytics
+import text_features
+from benchmarks.synthetic import make_news_frame
+
+def test_text_analyses_leave_the_shared_frame_untouched():
+    df = make_news_frame(300, seed=7).set_index(pd.RangeIndex(100, 400))
+    before = df.copy()
+    features = text_features.build(df['content'])
+
+    topics = analytics.topic_modeling(df, n_topics=3, features=features)
+    duplicates = analytics.find_duplicates(df, features=features)
+
+    pd.testing.assert_frame_equal(df, before)
+    assignments = topics.attrs['assignments']
+    assert list(topics.columns) == ['Topik 1', 'Topik 2', 'Topik 3']
+    assert assignments.index.equals(df.index) and set(assignments['topic']) <= set(topics.columns)
+    assert duplicates.index.equals(df.index)
+    assert (duplicates.to_numpy() == features.duplicate_groups()).all()
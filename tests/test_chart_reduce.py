@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+import chart_reduce
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(10_000)
+    y = np.sin(x / 100)
+    picked = chart_reduce.lttb(x, y, 500)
+    assert len(picked) == 500
+    assert picked[0] == 0 and picked[-1] == len(x) - 1
+    assert np.all(np.diff(picked) > 0)
+
+def test_lttb_keeps_spike():
+    y = np.zeros(5000)
+    y[1234] = 100
+    assert 1234 in chart_reduce.lttb(np.arange(5000), y, 100)
+
+def test_lttb_returns_everything_below_threshold():
+    np.testing.assert_array_equal(chart_reduce.lttb(np.arange(10), np.arange(10), 50), np.arange(10))
+
+def test_minmax_keeps_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_000)
+    picked = chart_reduce.minmax(y, 200)
+    assert len(picked) <= 200
+    assert y.argmin() in picked and y.argmax() in picked
+
+def test_cap_series_folds_small_groups_into_other():
+    df = pd.DataFrame({
+        'period': [1, 1, 1, 2, 2, 2],
+        'source': ['a', 'b', 'c', 'a', 'b', 'c'],
+        'count': [10, 5, 1, 10, 5, 2]
+    })
+    capped = chart_reduce.cap_series(df, 'period', 'count', 'source', max_series=2)
+    assert set(capped['source']) == {'a', 'b', chart_reduce.OTHER_LABEL}
+    assert capped['count'].sum() == df['count'].sum()
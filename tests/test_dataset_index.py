@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+from benchmarks.synthetic import make_news_frame
+from dataset_index import DatasetIndex
+
+@pytest.fixture(scope='module')
+def df():
+    clean = utils.validate_and_clean_data(make_news_frame(5000, seed=1))
+    df, _ = utils.optimize_dtypes(clean)
+    return df
+
+def _mask(df, date_range=None, **values):
+    mask = pd.Series(True, index=df.index)
+    if date_range:
+        mask &= df['day'].between(pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]))
+    for column, chosen in values.items():
+        if chosen:
+            mask &= df[column].astype(str).isin(chosen)
+    return np.flatnonzero(mask.to_numpy())
+
+@pytest.mark.parametrize('filters', [
+    {'date_range': ('2024-02-01', '2024-03-15')},
+    {'source': ['detik.com', 'tempo.co']},
+    {'date_range': ('2024-01-01', '2024-01-31'), 'source': ['kompas.com'], 'sentiment': ['positif', 'netral']},
+    {'sentiment': ['negatif'], 'source': ['bukan-sumber']},
+    {'date_range': ('2030-01-01', '2030-12-31'), 'sentiment': ['positif']},
+])
+def test_select_matches_boolean_scan(df, filters):
+    positions = DatasetIndex(df).select(**filters)
+    np.testing.assert_array_equal(positions, _mask(df, **filters))
+
+def test_select_without_filters_returns_none(df):
+    assert DatasetIndex(df).select(None, source=[], sentiment=[]) is None
@@ -0,0 +1,44 @@
+import io
+import json
+
+import pandas as pd
+
+import ingestion
+
+def _jsonl(rows):
+    return io.BytesIO('\n'.join(json.dumps(row) for row in rows).encode('utf-8'))
+
+def _row(date):
+    return {'date': date, 'title': 't', 'sentiment': 'positif', 'source': 's', 'content': 'c'}
+
+def test_parse_dates_indonesian_month_names():
+    parsed, fmt = ingestion.parse_dates(pd.Series(['3 Januari 2024', '15 Agustus 2024', '1 Desember 2024']))
+    assert fmt == '%d %B %Y'
+    assert parsed.tolist() == [pd.Timestamp('2024-01-03'), pd.Timestamp('2024-08-15'), pd.Timestamp('2024-12-01')]
+
+def test_parse_dates_mixed_datetime_and_text():
+    series = pd.Series([pd.Timestamp('2024-01-01'), '2024-01-02', 'bukan tanggal'], dtype=object)
+    parsed, fmt = ingestion.parse_dates(series)
+    assert fmt == '%Y-%m-%d'
+    assert parsed.tolist()[:2] == [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02')]
+    assert pd.isna(parsed.iloc[2])
+
+def test_jsonl_chunks_keep_detected_format():
+    # Chunk pertama dibaca read_json sebagai datetime, chunk kedua berisi satu tanggal rusak
+    rows = [_row(d) for d in ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', 'rusak', '2024-01-06']]
+    upload = _jsonl(rows)
+    upload.name = 'news.jsonl'
+    df, report = ingestion.read_jsonl_chunked(upload, chunksize=3)
+    assert report['issues']['invalid_date']['count'] == 1
+    assert report['issues']['invalid_date']['rows'] == [4]
+    assert df['date'].iloc[3] == pd.Timestamp('2024-01-04')
+    assert df['date'].iloc[5] == pd.Timestamp('2024-01-06')
+
+def test_validate_reuses_format_across_chunks():
+    report = ingestion.new_report()
+    first = pd.DataFrame([_row('03/01/2024'), _row('25/12/2024')])
+    second = pd.DataFrame([_row('04/01/2024')])
+    ingestion.validate(first, report=report)
+    df, report = ingestion.validate(second, report=report, offset=2)
+    assert report['date_formats']['date']['format'] == '%d/%m/%Y'
+    assert df['date'].iloc[0] == pd.Timestamp('2024-01-04')
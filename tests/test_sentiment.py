@@ -0,0 +1,29 @@
+import os
+import pandas as pd
+import pytest
+
+import analytics
+import database
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "app_data.db")
+    monkeypatch.setattr(database, 'DB_PATH', path)
+    return path
+
+def test_rerun_only_scores_new_content(db_path):
+    df = pd.DataFrame({'content': ['harga naik bagus', 'krisis buruk', 'harga naik bagus']})
+    analytics.deep_sentiment_analysis(df, scorer='lexicon')
+    assert df.attrs['sentiment_report']['scored'] == 2
+
+    updated = pd.concat([df[['content']], pd.DataFrame({'content': ['program baru']})], ignore_index=True)
+    analytics.deep_sentiment_analysis(updated, scorer='lexicon')
+    report = updated.attrs['sentiment_report']
+    assert (report['scored'], report['cache_hits'], report['cache_misses']) == (1, 3, 1)
+    assert updated['sentiment_score'].iloc[:3].tolist() == df['sentiment_score'].tolist()
+
+def test_cache_opt_out_leaves_database_untouched(db_path):
+    df = pd.DataFrame({'content': ['harga naik bagus']})
+    analytics.deep_sentiment_analysis(df, scorer='lexicon', use_cache=False)
+    assert 'scored' not in df.attrs['sentiment_report']
+    assert not os.path.exists(db_path)
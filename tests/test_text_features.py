@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+import text_features
+
+DOCS = [
+    'harga beras naik di jakarta',
+    'banjir melanda jakarta utara',
+    'jakarta naik harga beras',
+    'startup digital dapat investasi',
+    'yang dan di',
+]
+
+def test_build_removes_stop_words_and_hashes_content():
+    features = text_features.build(DOCS)
+    assert 'yang' not in features.vocabulary and 'di' not in features.vocabulary
+    assert len(features) == len(DOCS)
+    assert (features.hashes == text_features.content_hashes(DOCS)).all()
+
+def test_subset_matches_rows():
+    features = text_features.build(DOCS)
+    subset = features.subset(np.array([3, 0]))
+    assert (subset.matrix != features.matrix[[3, 0]]).nnz == 0
+    assert (subset.hashes == features.hashes[[3, 0]]).all()
+
+def test_merge_equals_rebuild():
+    merged = text_features.merge(text_features.build(DOCS[:2]), text_features.build(DOCS[2:]))
+    full = text_features.build(DOCS)
+    assert (merged.vocabulary == full.vocabulary).all()
+    assert (merged.matrix != full.matrix).nnz == 0
+    assert (merged.hashes == full.hashes).all()
+
+def test_select_reindexes_and_zero_fills():
+    features = text_features.build(DOCS)
+    counts = features.select(['jakarta', 'tidak-ada']).toarray()
+    assert counts[:, 0].tolist() == [1, 1, 1, 0, 0]
+    assert counts[:, 1].sum() == 0
+
+def test_duplicate_groups_ignore_word_order():
+    groups = text_features.build(DOCS).duplicate_groups()
+    assert groups[0] == groups[2] != -1
+    assert groups[1] == groups[3] == -1
+    # Dokumen yang hanya berisi stop words tidak dihitung duplikat
+    assert groups[4] == -1
+
+def test_save_load_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_features.dataset_cache, 'CACHE_DIR', str(tmp_path))
+    features = text_features.build(pd.Series(DOCS))
+    assert text_features.save('k', features)
+    loaded = text_features.load('k')
+    assert (loaded.matrix != features.matrix).nnz == 0
+    assert (loaded.vocabulary == features.vocabulary).all()
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import text_features
+import topic_model
+from benchmarks.synthetic import make_news_frame
+
+@pytest.fixture(scope='module')
+def texts():
+    return make_news_frame(600, seed=5)['content'].astype(str).tolist()
+
+def test_streamed_fit_matches_in_memory_fit(texts):
+    whole = topic_model.TopicModel(3, batch_size=100, n_jobs=1).fit(text_features.build(texts), passes=1)
+    stream = lambda: (text_features.build(texts[i:i + 100]) for i in range(0, len(texts), 100))
+    streamed = topic_model.TopicModel(3, batch_size=100, n_jobs=1).fit(stream, passes=1)
+    assert (whole.vocabulary == streamed.vocabulary).all()
+    np.testing.assert_allclose(whole.lda.components_, streamed.lda.components_)
+    assert whole.assign(text_features.build(texts)).equals(streamed.assign(stream))
+
+def test_update_only_learns_new_documents(texts):
+    model = topic_model.TopicModel(3, batch_size=100, n_jobs=1).fit(text_features.build(texts[:400]), passes=1)
+    assert model.update(text_features.build(texts[300:])) == 200
+    assert model.update(text_features.build(texts)) == 0
+
+def test_load_rejects_other_versions(texts, tmp_path, monkeypatch):
+    monkeypatch.setattr(topic_model, 'MODELS_DIR', str(tmp_path))
+    model = topic_model.TopicModel(3, batch_size=100, n_jobs=1).fit(text_features.build(texts), passes=1)
+    model.save('a')
+    assert topic_model.TopicModel.load('a').vocabulary.tolist() == model.vocabulary.tolist()
+    monkeypatch.setattr(topic_model, 'TOPIC_MODEL_VERSION', topic_model.TOPIC_MODEL_VERSION + 1)
+    assert topic_model.TopicModel.load('a') is None
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+import rollup
+import utils
+from benchmarks.synthetic import make_news_frame
+
+def _frame(n_rows, seed):
+    df, _ = utils.optimize_dtypes(utils.validate_and_clean_data(make_news_frame(n_rows, seed=seed)))
+    return df
+
+def test_row_keys_ignore_content_and_index():
+    df = pd.DataFrame({'title': ['a', 'b'], 'source': ['s', 's'], 'date': ['2024-01-01', '2024-01-01'], 'content': ['x', 'y']})
+    other = df.assign(content=['z', 'z']).set_axis([10, 11])
+    assert (utils.row_keys(df) == utils.row_keys(other)).all()
+    assert utils.row_keys(df)[0] != utils.row_keys(df)[1]
+
+def test_append_rows_skips_known_and_repeated_rows():
+    df = _frame(200, seed=0)
+    new = pd.concat([df.iloc[:50], _frame(30, seed=1), _frame(30, seed=1).iloc[:5]], ignore_index=True)
+    merged, fresh = utils.append_rows(df, new)
+    assert len(fresh) == 30
+    assert len(merged) == 230
+    assert merged['row_key'].is_unique
+
+def test_update_profile_matches_full_profile():
+    first, second = _frame(300, seed=0), _frame(200, seed=1)
+    merged = utils.update_data_profile(utils.generate_data_profile(first), second)
+    full = utils.generate_data_profile(pd.concat([first, second], ignore_index=True))
+    for key in ['total_news', 'source_counts', 'sentiment_counts', 'day_counts', 'n_sources',
+                'dominant_sentiment', 'date_range', 'busiest_day', 'growth']:
+        assert merged[key] == full[key], key
+
+def test_sentiment_timeseries_matches_weekly_resample():
+    df = _frame(2000, seed=2)
+    # Sisakan minggu kosong di tengah rentang
+    df = df[(df['day'] < '2024-03-01') | (df['day'] > '2024-03-20')]
+    expected = df.set_index('date').resample('W')['sentiment'].value_counts().unstack().fillna(0)
+    expected = expected.div(expected.sum(axis=1), axis=0)
+    for data in [df, rollup.build(df)]:
+        fig = utils.plot_sentiment_timeseries(data)
+        for trace in fig.data:
+            assert list(pd.to_datetime(trace.x)) == list(expected.index)
+            np.testing.assert_allclose(trace.y, expected[trace.name].to_numpy(), equal_nan=True)
+
+def test_optimize_dtypes_reports_memory_against_object_columns():
+    raw = make_news_frame(2000, seed=3)
+    parsed = raw.assign(source=raw['source'].astype('category'))
+    df, report = utils.optimize_dtypes(parsed)
+    assert report['before'] == raw.memory_usage(deep=True).sum()
+    assert report['saved'] == report['before'] - report['after'] > 0
+    # Frame diubah di tempat dan mendapat kolom day
+    assert df is parsed and 'day' in parsed.columns
+
+def test_cube_keeps_integer_metrics_integral():
+    df = _frame(2000, seed=4)
+    cube = rollup.build(df, utils.metric_columns(df))
+    assert cube['count'].dtype == 'int64' and cube['sentiment_score'].dtype == 'float64'
+    result = rollup.aggregate(cube, 'W', 'count', 'source')
+    # Kolom count dipadatkan ke int8; cube menjumlah dalam int64
+    counts = df['count'].astype('int64')
+    expected = counts.groupby([df['day'].dt.to_period('W').dt.start_time.rename('period'), df['source']], observed=True).sum()
+    pd.testing.assert_series_equal(result.set_index(['period', 'source'])['count'].sort_index(), expected.sort_index())
@@ -0,0 +1,135 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, ENGLISH_STOP_WORDS
+import dataset_cache
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS_PATH = os.path.join(os.path.dirname(__file__), "data", "stopwords_id.txt")
+
+def load_stopwords(path=STOPWORDS_PATH):
+    """Indonesian stop words plus scikit-learn's English list (news often mixes both)"""
+    with open(path, encoding='utf-8') as f:
+        words = {line.strip().lower() for line in f if line.strip()}
+    return sorted(words | ENGLISH_STOP_WORDS)
+
+def content_hashes(texts):
+    """Stable 64-bit hash per text, used to recognise documents already processed"""
+    return pd.util.hash_pandas_object(pd.Series(texts, dtype=object), index=False).to_numpy()
+
+class TextFeatures:
+    """
+    Term counts of a corpus: a sparse document-term matrix, its sorted
+    vocabulary and a content hash per document.
+
+    Built once per dataset version and shared by topic modeling, keyword
+    extraction and duplicate detection, so the text is tokenized once.
+    No document-frequency pruning is applied; consumers pick their own
+    thresholds, which also keeps merged features identical to a rebuild.
+    """
+
+    def __init__(self, matrix, vocabulary, hashes):
+        self.matrix = matrix.tocsr()
+        self.matrix.sort_indices()
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        self.hashes = np.asarray(hashes)
+        self._lookup = None
+        self._tfidf = None
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def columns(self, words):
+        """Column of every word (-1 for words outside the vocabulary)"""
+        if self._lookup is None:
+            self._lookup = {word: i for i, word in enumerate(self.vocabulary)}
+        return np.array([self._lookup.get(word, -1) for word in words], dtype=np.intp)
+
+    def select(self, words):
+        """Counts re-indexed to the given word list (words outside the vocabulary count 0)"""
+        cols = self.columns(words)
+        present = np.flatnonzero(cols >= 0)
+        selector = sparse.csr_matrix(
+            (np.ones(len(present), dtype=self.matrix.dtype), (cols[present], present)),
+            shape=(len(self.vocabulary), len(words))
+        )
+        return (self.matrix @ selector).tocsr()
+
+    def subset(self, positions):
+        """Features of the documents at the given row positions"""
+        return TextFeatures(self.matrix[positions], self.vocabulary, self.hashes[positions])
+
+    @property
+    def tfidf(self):
+        if self._tfidf is None:
+            self._tfidf = TfidfTransformer().fit_transform(self.matrix)
+        return self._tfidf
+
+    def keywords(self, n=20):
+        """Words with the highest summed TF-IDF over the corpus"""
+        scores = np.asarray(self.tfidf.sum(axis=0)).ravel()
+        top = np.argsort(scores, kind='stable')[::-1][:n]
+        return pd.DataFrame({'keyword': self.vocabulary[top], 'score': scores[top]})
+
+    def duplicate_groups(self):
+        """
+        Group id per document whose term counts match another document
+        exactly (same words, ignoring order and stop words); -1 otherwise.
+        """
+        m = self.matrix
+        keys = [m.indices[a:b].tobytes() + m.data[a:b].tobytes() for a, b in zip(m.indptr[:-1], m.indptr[1:])]
+        codes, _ = pd.factorize(pd.Series(keys, dtype=object))
+        sizes = np.bincount(codes)
+        # Dokumen tanpa kata (kosong atau hanya stop words) tidak dianggap duplikat
+        return np.where((sizes[codes] > 1) & (np.diff(m.indptr) > 0), codes, -1)
+
+def build(texts):
+    """Tokenize and count a corpus once"""
+    texts = pd.Series(texts, dtype=object).fillna('').astype(str)
+    vectorizer = CountVectorizer(stop_words=load_stopwords(), dtype=np.int32)
+    matrix = vectorizer.fit_transform(texts)
+    logger.info(f"Fitur teks: {matrix.shape[0]} dokumen, {matrix.shape[1]} kata")
+    return TextFeatures(matrix, vectorizer.get_feature_names_out(), content_hashes(texts))
+
+def merge(features, new_features):
+    """Stack the features of appended documents under existing ones, over the union vocabulary"""
+    vocabulary = np.union1d(features.vocabulary, new_features.vocabulary)
+    matrix = sparse.vstack([features.select(vocabulary), new_features.select(vocabulary)])
+    return TextFeatures(matrix, vocabulary, np.concatenate([features.hashes, new_features.hashes]))
+
+def _path(key):
+    return dataset_cache.aux_path(key, "features.npz")
+
+def load(key):
+    """Stored features of a dataset version, or None"""
+    path = _path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            matrix = sparse.csr_matrix((data['data'], data['indices'], data['indptr']), shape=tuple(data['shape']))
+            features = TextFeatures(matrix, data['vocabulary'], data['hashes'])
+    except Exception as e:
+        logger.warning(f"Cache fitur teks dataset {key[:12]} rusak, diabaikan: {str(e)}")
+        return None
+    os.utime(path)
+    return features
+
+def save(key, features):
+    """Store features next to the dataset in the cache; evicted together with it"""
+    os.makedirs(dataset_cache.CACHE_DIR, exist_ok=True)
+    path = _path(key)
+    m = features.matrix
+    try:
+        with open(f"{path}.tmp", 'wb') as f:
+            np.savez(f, data=m.data, indices=m.indices, indptr=m.indptr, shape=np.array(m.shape),
+                     vocabulary=features.vocabulary, hashes=features.hashes)
+        os.replace(f"{path}.tmp", path)
+    except Exception as e:
+        logger.warning(f"Gagal menyimpan fitur teks dataset: {str(e)}")
+        return False
+    dataset_cache.evict()
+    return True
@@ -0,0 +1,151 @@
+import os
+import logging
+from collections import Counter
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.decomposition import LatentDirichletAllocation
+import text_features
+
+logger = logging.getLogger(__name__)
+
+# Folder model topik yang sudah dilatih (joblib)
+MODELS_DIR = os.getenv("TOPIC_MODELS_DIR", os.path.join(os.path.dirname(__file__), "models"))
+# Jumlah dokumen per mini-batch partial_fit
+TOPIC_BATCH_SIZE = int(os.getenv("TOPIC_BATCH_SIZE", "2000"))
+# Jumlah proses untuk E-step LDA (default: semua core)
+TOPIC_JOBS = int(os.getenv("TOPIC_JOBS", str(os.cpu_count() or 1)))
+# Ukuran kosakata maksimum (kata dengan frekuensi dokumen tertinggi)
+TOPIC_VOCAB_SIZE = int(os.getenv("TOPIC_VOCAB_SIZE", "20000"))
+# Jumlah putaran atas korpus saat model pertama kali dilatih
+TOPIC_PASSES = int(os.getenv("TOPIC_PASSES", "2"))
+# Naikkan jika atribut model berubah; model tersimpan dengan versi lain dilatih ulang
+TOPIC_MODEL_VERSION = 2
+
+def _batches(matrix, batch_size):
+    for i in range(0, matrix.shape[0], batch_size):
+        yield matrix[i:i + batch_size]
+
+def _chunks(features):
+    """
+    Iterate over a TextFeatures, or over the chunks yielded by a callable
+    (called once per pass, so a corpus can be streamed from disk).
+    """
+    if isinstance(features, text_features.TextFeatures):
+        return [features]
+    return features()
+
+class TopicModel:
+    """
+    Online LDA over a fixed, persisted vocabulary.
+
+    Works on text_features.TextFeatures, so the corpus is never
+    tokenized here. fit/update/assign also take a callable returning an
+    iterator of TextFeatures chunks, e.g.
+    lambda: (text_features.build(c['content']) for c in pd.read_csv(path, chunksize=50_000)),
+    so corpora larger than memory are streamed. The vocabulary is fixed on the first fit; later
+    features are re-indexed to it, so new data can be folded in with
+    partial_fit mini-batches without refitting. Content hashes of the
+    documents already learned are kept so updates skip them.
+    """
+
+    def __init__(self, n_topics=5, batch_size=TOPIC_BATCH_SIZE, n_jobs=TOPIC_JOBS):
+        self.n_topics = n_topics
+        self.batch_size = batch_size
+        self.vocabulary = None
+        self.lda = LatentDirichletAllocation(
+            n_components=n_topics,
+            learning_method='online',
+            learning_offset=50.,
+            batch_size=batch_size,
+            n_jobs=n_jobs,
+            random_state=0
+        )
+        self.seen = np.array([], dtype='uint64')
+
+    def build_vocabulary(self, features, max_df=0.95, min_df=2, max_features=TOPIC_VOCAB_SIZE):
+        """Fix the vocabulary to the most frequent words within the document-frequency bounds"""
+        doc_freq = Counter()
+        n_docs = 0
+        for chunk in _chunks(features):
+            # Indeks kolom CSR unik per baris, jadi bincount = frekuensi dokumen
+            freq = np.bincount(chunk.matrix.indices, minlength=len(chunk.vocabulary))
+            present = np.flatnonzero(freq)
+            doc_freq.update(dict(zip(chunk.vocabulary[present].tolist(), freq[present].tolist())))
+            n_docs += len(chunk)
+        words = [word for word, freq in doc_freq.most_common() if min_df <= freq <= max_df * n_docs]
+        if not words:
+            raise ValueError("Kosakata kosong: teks terlalu sedikit atau hanya berisi stop words")
+        self.vocabulary = np.array(sorted(words[:max_features]), dtype=str)
+        return self
+
+    def _counts(self, features):
+        return features.select(self.vocabulary)
+
+    def partial_fit(self, features):
+        """Update the topics with one pass over the documents, in mini-batches"""
+        for chunk in _chunks(features):
+            for batch in _batches(self._counts(chunk), self.batch_size):
+                self.lda.partial_fit(batch)
+            self.seen = np.union1d(self.seen, chunk.hashes)
+        return self
+
+    def fit(self, features, passes=TOPIC_PASSES):
+        self.build_vocabulary(features)
+        for _ in range(passes):
+            self.partial_fit(features)
+        return self
+
+    def update(self, features):
+        """Fold in only the documents the model has not learned yet; returns how many were new"""
+        n_new = n_docs = 0
+        for chunk in _chunks(features):
+            new = np.flatnonzero(~np.isin(chunk.hashes, self.seen))
+            if len(new):
+                self.partial_fit(chunk.subset(new))
+            n_new += len(new)
+            n_docs += len(chunk)
+        logger.info(f"Model topik: {n_new} dokumen baru dari {n_docs}")
+        return n_new
+
+    def topics(self, n_words=10):
+        """Top n_words per topic as a DataFrame with one "Topik N" column per topic"""
+        return pd.DataFrame({
+            f"Topik {topic_idx + 1}": [self.vocabulary[i] for i in topic.argsort()[:-n_words - 1:-1]]
+            for topic_idx, topic in enumerate(self.lda.components_)
+        })
+
+    def assign(self, features):
+        """Dominant topic label and its weight per document"""
+        weights = np.vstack([
+            self.lda.transform(batch)
+            for chunk in _chunks(features)
+            for batch in _batches(self._counts(chunk), self.batch_size)
+        ])
+        dominant = weights.argmax(axis=1)
+        return pd.DataFrame({
+            'topic': [f"Topik {i + 1}" for i in dominant],
+            'topic_weight': weights[np.arange(len(weights)), dominant]
+        })
+
+    def save(self, name):
+        os.makedirs(MODELS_DIR, exist_ok=True)
+        path = os.path.join(MODELS_DIR, f"topics_{name}.joblib")
+        joblib.dump({'version': TOPIC_MODEL_VERSION, 'model': self}, path)
+        return path
+
+    @staticmethod
+    def load(name):
+        """Saved model by name, or None if there is none or it was saved by an incompatible version"""
+        path = os.path.join(MODELS_DIR, f"topics_{name}.joblib")
+        if not os.path.exists(path):
+            return None
+        try:
+            payload = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Model topik {name} tidak bisa dibaca, dilatih ulang: {str(e)}")
+            return None
+        if not isinstance(payload, dict) or payload.get('version') != TOPIC_MODEL_VERSION:
+            logger.warning(f"Model topik {name} dari versi lain, dilatih ulang")
+            return None
+        return payload['model']
@@ -4,19 +4,36 @@ import streamlit as st
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
 import logging
+import importlib.util
+from ingestion import NEWS_SCHEMA, SUPPORTED_EXTENSIONS, CSV_CHUNK_SIZE, list_excel_sheets
+import ingestion
+import rollup
 
 logger = logging.getLogger(__name__)
 
-# Define COLUMN_MAPPING as a constant
-COLUMN_MAPPING = {
-    'tanggal': 'date',
-    'judul': 'title',
-    'sentimen': 'sentiment',
-    'sumber': 'source',
-    'isi': 'content',
-    'kategori': 'category'
-}
+# Alias kolom dari skema ingestion, dipertahankan untuk kompatibilitas
+COLUMN_MAPPING = NEWS_SCHEMA['aliases']
+REQUIRED_COLUMNS = NEWS_SCHEMA['required']
+
+# Kolom pembentuk kunci baris untuk deduplikasi mode append
+ROW_KEY_COLUMNS = ['title', 'source', 'date']
+
+# Kolom turunan internal yang tidak ditawarkan sebagai pilihan analisis
+INTERNAL_COLUMNS = ['day', 'row_key']
+
+# Kolom teks panjang disimpan sebagai string berbasis Arrow (jika pyarrow tersedia)
+TEXT_COLUMNS = ['title', 'content']
+
+# Hitungan mentah di profil; statistik lain diturunkan dari sini
+PROFILE_COUNT_KEYS = ['source_counts', 'sentiment_counts', 'day_counts']
+
+# Panjang jendela (hari) untuk pertumbuhan dibanding periode sebelumnya
+GROWTH_WINDOW_DAYS = 7
+
+# Kolom object lain dijadikan category jika rasio nilai unik di bawah batas ini
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
 
 def create_metric_card(title, value, icon, color):
     """Create modern metric card with hover effect"""
@@ -42,71 +59,150 @@ def create_metric_card(title, value, icon, color):
 
 def validate_and_clean_data(df):
     """Validate and clean the news data"""
-    # Use the defined COLUMN_MAPPING
-    column_mapping = COLUMN_MAPPING
-    
-    # Rename columns
-    df.columns = [col.strip().lower() for col in df.columns]
-    df.rename(columns=column_mapping, inplace=True)
+    # Sentimen tidak wajib di sini, hanya divalidasi jika ada
+    schema = dict(NEWS_SCHEMA, required=['date', 'title', 'source', 'content'])
+    df, report = ingestion.validate(df, schema)
     
-    # Check required columns
-    required_columns = ['date', 'title', 'source', 'content']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    if report['missing_columns']:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(report['missing_columns'])}")
     
-    if missing_columns:
-        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing_columns)}")
+    for message in ingestion.describe_issues(report, schema):
+        logger.warning(message)
     
-    # Clean date
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce', format='%Y-%m-%d')
-        invalid_dates = df[df['date'].isna()]
-        if not invalid_dates.empty:
-            logger.warning(f"Ditemukan {len(invalid_dates)} baris dengan tanggal tidak valid")
+    return df
+
+def _finalize_profile(profile):
+    """Derive every displayed statistic from the running counts (no data scans)"""
+    source_counts = pd.Series(profile['source_counts'], dtype='int64').sort_values(ascending=False, kind='stable')
+    profile['sources'] = source_counts.head(5).to_dict()
+    profile['n_sources'] = len(source_counts)
     
-    # Clean sentiment
-    if 'sentiment' in df.columns:
-        valid_sentiments = ['positif', 'negatif', 'netral']
-        df['sentiment'] = df['sentiment'].str.lower()
-        invalid_sentiments = ~df['sentiment'].isin(valid_sentiments)
-        if invalid_sentiments.any():
-            logger.warning(f"Ditemukan {invalid_sentiments.sum()} sentimen tidak valid")
+    sentiment_counts = pd.Series(profile['sentiment_counts'], dtype='int64').sort_values(ascending=False, kind='stable')
+    sentiment_total = sentiment_counts.sum()
+    profile['sentiment_dist'] = (sentiment_counts / sentiment_total).to_dict() if sentiment_total else {}
+    profile['dominant_sentiment'] = sentiment_counts.index[0] if sentiment_total else None
     
-    return df
+    profile['date_range'] = None
+    profile['busiest_day'] = None
+    profile['growth'] = None
+    day_counts = pd.Series(profile['day_counts'], dtype='int64')
+    if not day_counts.empty:
+        day_counts.index = pd.to_datetime(day_counts.index)
+        day_counts = day_counts.sort_index()
+        profile['date_range'] = {
+            'min': day_counts.index[0].strftime('%Y-%m-%d'),
+            'max': day_counts.index[-1].strftime('%Y-%m-%d')
+        }
+        profile['busiest_day'] = {
+            'date': day_counts.idxmax().strftime('%Y-%m-%d'),
+            'count': int(day_counts.max())
+        }
+        # Pertumbuhan: jendela terakhir dibanding jendela sebelumnya dengan panjang sama
+        window = pd.Timedelta(days=GROWTH_WINDOW_DAYS)
+        last_day = day_counts.index[-1]
+        current = int(day_counts[day_counts.index > last_day - window].sum())
+        previous = int(day_counts[(day_counts.index > last_day - 2 * window) & (day_counts.index <= last_day - window)].sum())
+        profile['growth'] = {
+            'days': GROWTH_WINDOW_DAYS,
+            'current': current,
+            'previous': previous,
+            'pct': (current - previous) / previous * 100 if previous else None
+        }
+    return profile
+
+def _value_counts(values):
+    counts = values.value_counts()
+    return {str(k): int(v) for k, v in counts[counts > 0].items()}
+
+def _day_counts(df):
+    if 'day' in df.columns:
+        days = df['day']
+    elif 'date' in df.columns:
+        days = pd.to_datetime(df['date'], errors='coerce').dt.normalize()
+    else:
+        return {}
+    counts = days.value_counts()
+    return {k.strftime('%Y-%m-%d'): int(v) for k, v in counts.items()}
 
 def generate_data_profile(df):
-    """Generate comprehensive data profile"""
+    """
+    Profile every dashboard statistic in one pass over the data.
+
+    Only the per-source, per-sentiment and per-day counts touch the rows;
+    totals, date range, busiest day and growth are derived from them, so
+    the profile can also be merged incrementally (update_data_profile).
+    """
     profile = {
         'total_news': len(df),
-        'sources': {},
-        'date_range': None,
-        'sentiment_dist': {}
+        'source_counts': _value_counts(df['source']) if 'source' in df.columns else {},
+        'sentiment_counts': _value_counts(df['sentiment']) if 'sentiment' in df.columns else {},
+        'day_counts': _day_counts(df)
     }
-    
-    if 'date' in df.columns and not df.empty:
-        min_date = df['date'].min()
-        max_date = df['date'].max()
-        if pd.notnull(min_date) and pd.notnull(max_date):
-            profile['date_range'] = {
-                'min': min_date.strftime('%Y-%m-%d'),
-                'max': max_date.strftime('%Y-%m-%d')
-            }
-    
-    if 'source' in df.columns and not df.empty:
-        profile['sources'] = df['source'].value_counts().head(5).to_dict()
-    
-    if 'sentiment' in df.columns and not df.empty:
-        sentiment_counts = df['sentiment'].value_counts(normalize=True)
-        profile['sentiment_dist'] = sentiment_counts.to_dict()
-    
-    return profile
+    return _finalize_profile(profile)
+
+def update_data_profile(profile, new_df):
+    """Fold newly appended rows into an existing profile in O(new rows)"""
+    new_profile = generate_data_profile(new_df)
+    profile = dict(profile)
+    profile['total_news'] = profile['total_news'] + new_profile['total_news']
+    for key in PROFILE_COUNT_KEYS:
+        merged = dict(profile.get(key, {}))
+        for value, count in new_profile[key].items():
+            merged[value] = merged.get(value, 0) + count
+        profile[key] = merged
+    return _finalize_profile(profile)
+
+def profile_is_current(profile):
+    """Profiles saved before the per-day counts existed must be rebuilt"""
+    return bool(profile) and all(key in profile for key in PROFILE_COUNT_KEYS)
 
-def plot_sentiment_timeseries(df):
-    """Plot sentiment over time"""
-    if 'date' not in df.columns or 'sentiment' not in df.columns:
+def row_keys(df):
+    """Stable per-row key (hash of title, source and date) used to dedup appends"""
+    return pd.util.hash_pandas_object(df[ROW_KEY_COLUMNS], index=False).to_numpy()
+
+def append_rows(df, new_df):
+    """
+    Append rows of new_df that are not already in df.
+
+    Returns (merged, fresh) where fresh holds only the rows actually added.
+    Keys come from the `row_key` column, computed here if a frame lacks it.
+    """
+    if 'row_key' not in df.columns:
+        df = df.assign(row_key=row_keys(df))
+    if 'row_key' not in new_df.columns:
+        new_df = new_df.assign(row_key=row_keys(new_df))
+    existing = pd.Index(df['row_key']).unique()
+    fresh = new_df[existing.get_indexer(new_df['row_key']) < 0]
+    fresh = fresh.drop_duplicates(subset='row_key')
+    merged = ingestion.concat_frames([df, fresh])
+    return merged, fresh
+
+def metric_columns(df):
+    """Numeric columns offered as metrics (summed in the rollup cube)"""
+    return [col for col in df.select_dtypes(include=np.number).columns if col not in INTERNAL_COLUMNS]
+
+def plot_sentiment_timeseries(data):
+    """
+    Plot weekly sentiment proportions.
+
+    `data` is a rollup cube (rollup.build) or, as before, a frame of news
+    rows, which is rolled up first. Weeks are labelled by their last day
+    (Sunday), like resample('W').
+    """
+    if data is None or 'sentiment' not in data.columns:
+        return None
+    if rollup.ROW_COUNT in data.columns and 'day' in data.columns:
+        cube = data
+    elif 'date' in data.columns:
+        cube = rollup.build(data)
+    else:
         return None
     
-    # Resample by week
-    df_weekly = df.set_index('date').resample('W')['sentiment'].value_counts().unstack().fillna(0)
+    weekly = rollup.aggregate(cube, 'W', rollup.ROW_COUNT, by='sentiment')
+    df_weekly = weekly.pivot_table(index='period', columns='sentiment', values=rollup.ROW_COUNT, fill_value=0, observed=True)
+    # Label akhir minggu dan minggu kosong tetap ada, sama seperti resample('W')
+    df_weekly.index = (df_weekly.index + pd.Timedelta(days=6)).rename('date')
+    df_weekly = df_weekly.asfreq('W-SUN', fill_value=0)
     df_weekly = df_weekly.div(df_weekly.sum(axis=1), axis=0)
     
     fig = px.area(
@@ -122,43 +218,77 @@ def plot_sentiment_timeseries(df):
     fig.update_layout(yaxis_tickformat=".0%")
     return fig
 
-def process_upload(uploaded_file):
-    """Proses file CSV yang diupload"""
+def process_upload(uploaded_file, chunksize=CSV_CHUNK_SIZE, progress_callback=None, sheet_name=None):
+    """Proses file yang diupload, mengembalikan (df, error)"""
     try:
-        # Deteksi format file
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file)
-        else:
-            return None, "Format file tidak didukung. Gunakan CSV atau Excel."
-        
-        # Auto rename columns
-        df.columns = [col.strip().lower() for col in df.columns]
-        # Use the defined COLUMN_MAPPING
-        df.rename(columns=lambda x: COLUMN_MAPPING.get(x, x), inplace=True)
+        df, report = ingestion.ingest(
+            uploaded_file, chunksize=chunksize, progress_callback=progress_callback, sheet_name=sheet_name
+        )
         
         # Validasi kolom wajib
-        required_columns = ['date', 'title', 'sentiment', 'source', 'content']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            return None, f"Kolom wajib tidak ditemukan: {', '.join(missing_columns)}"
+        if report['missing_columns']:
+            return None, f"Kolom wajib tidak ditemukan: {', '.join(report['missing_columns'])}"
         
-        # Konversi tanggal
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        
-        # Validasi sentimen
-        valid_sentiments = ['positif', 'negatif', 'netral']
-        invalid_sentiments = df[~df['sentiment'].str.lower().isin(valid_sentiments)]
-        if not invalid_sentiments.empty:
-            st.warning(f"Terdapat {len(invalid_sentiments)} sentimen tidak valid. Hanya gunakan: Positif, Negatif, Netral")
+        for message in ingestion.describe_issues(report):
+            st.warning(message)
         
         return df, None
         
     except Exception as e:
         return None, f"Error memproses file: {str(e)}"
 
+def _raw_memory(df):
+    """
+    Deep memory usage with categoricals counted as the object columns they
+    replace, since the chunked readers already parse them as categoricals.
+    """
+    total = int(df.index.memory_usage(deep=True))
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Satu pointer per baris plus ukuran objek nilainya, seperti kolom object
+            sizes = np.array([sys.getsizeof(value) for value in series.cat.categories] + [sys.getsizeof(np.nan)])
+            total += 8 * len(series) + int(sizes[series.cat.codes.to_numpy()].sum())
+        else:
+            total += int(series.memory_usage(deep=True, index=False))
+    return total
+
+def optimize_dtypes(df):
+    """
+    Convert a cleaned frame to compact dtypes.
+
+    The frame is modified in place (pass a copy to keep the original) and
+    gains a `day` column, the normalized `date`. Low-cardinality object
+    columns become categoricals, long text becomes Arrow-backed strings and
+    numeric columns are downcast. Returns (df, report) where report holds
+    memory usage in bytes before and after; "before" counts categorical
+    columns as the object columns they came from.
+    """
+    before = _raw_memory(df)
+    
+    for col in df.columns:
+        series = df[col]
+        if col in TEXT_COLUMNS:
+            if series.dtype == object and importlib.util.find_spec("pyarrow") is not None:
+                df[col] = series.astype('string[pyarrow]')
+        elif series.dtype == object:
+            if len(series) and series.nunique(dropna=True) / len(series) <= CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+    
+    if 'date' in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df['day'] = df['date'].dt.normalize()
+    
+    after = int(df.memory_usage(deep=True).sum())
+    report = {'before': before, 'after': after, 'saved': before - after}
+    logger.info(f"Optimasi dtype: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+    return df, report
+
 def generate_template():
     """Generate sample CSV template"""
     data = {